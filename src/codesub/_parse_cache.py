@@ -0,0 +1,68 @@
+"""Content-addressed cache of indexed constructs.
+
+Indexing a file with tree-sitter is the most expensive step of a semantic
+scan, and the same file content is indexed again and again: by every scan
+of an unchanged file, by the API server on each request, and by the
+update/show commands. Constructs depend only on the source text, the
+language and the path they are reported under, so results are keyed on
+exactly that.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .semantic import Construct
+    from .semantic.indexer_protocol import SemanticIndexer
+
+# Number of indexed files kept in memory
+MAX_ENTRIES = 256
+
+_cache: OrderedDict[tuple[str, str, str], tuple[Construct, ...]] = OrderedDict()
+_lock = threading.Lock()
+
+
+def source_digest(source: str) -> str:
+    """Return the content hash used to key the cache."""
+    return hashlib.sha256(source.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def get_or_index(
+    source: str, path: str, language: str, indexer: SemanticIndexer
+) -> list[Construct]:
+    """Return the constructs of a file, indexing it only on a cache miss.
+
+    Args:
+        source: File content.
+        path: Path the constructs are reported under.
+        language: Language identifier of the indexer.
+        indexer: Indexer used on a cache miss.
+
+    Returns:
+        A new list of constructs; callers may mutate the list freely.
+    """
+    key = (source_digest(source), language, path)
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return list(cached)
+
+    constructs = indexer.index_file(source, path)
+
+    with _lock:
+        _cache[key] = tuple(constructs)
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return list(constructs)
+
+
+def clear() -> None:
+    """Drop all cached entries. Mainly for testing."""
+    with _lock:
+        _cache.clear()
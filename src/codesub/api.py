@@ -1119,8 +1119,7 @@ def get_project_file_symbols(
     baseline = config.repo.baseline_ref
 
     # Get file content
-    lines = repo.show_file(baseline, path)
-    source = "\n".join(lines)
+    source = repo.show_file_text(baseline, path)
 
     # Get indexer
     from .semantic import get_indexer_for_path
@@ -1,24 +1,60 @@
-"""Command-line interface for codesub."""
+"""Command-line interface for codesub.
+
+Only argparse-related modules are imported at load time; each command
+imports what it needs so that ``--help``/``--version`` stay cheap.
+"""
+
+from __future__ import annotations
 
 import argparse
-import json
+import functools
+import os
 import sys
-from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from . import __version__
-from .config_store import ConfigStore
 from .errors import CodesubError, ProjectNotRegisteredError
-from .git_repo import GitRepo
-from .models import Anchor, SemanticTarget, Subscription
-from .utils import (
-    LineTarget,
-    SemanticTargetSpec,
-    extract_anchors,
-    format_subscription,
-    parse_target_spec,
-)
-from .project_store import ProjectStore
-from .scan_history import ScanHistory
+
+if TYPE_CHECKING:
+    from .config_store import ConfigStore
+    from .git_repo import GitRepo
+    from .models import Anchor
+    from .utils import LineTarget, SemanticTargetSpec
+
+# Top-level help printed by main() without building the parser.
+# Keep in sync with create_parser().
+_ROOT_HELP = """\
+usage: codesub [-h] [--version]
+               {add,list,remove,symbols,scan,apply-updates,serve,projects,scan-history}
+               ...
+
+Subscribe to file line ranges and detect changes via git diff.
+
+positional arguments:
+  {add,list,remove,symbols,scan,apply-updates,serve,projects,scan-history}
+                        Commands
+    add                 Add a new subscription
+    list                List subscriptions
+    remove              Remove a subscription
+    symbols             List discoverable code constructs in a file
+    scan                Scan for changes and report triggered subscriptions
+    apply-updates       Apply update proposals from an update document
+    serve               Start the API server
+    projects            Manage registered projects
+    scan-history        Manage scan history
+
+options:
+  -h, --help            show this help message and exit
+  --version, -V         show program's version number and exit
+"""
+
+
+@functools.cache
+def _get_update_doc_module():
+    """Import update_doc on first use; cached for repeated scans in one process."""
+    from . import update_doc
+
+    return update_doc
 
 
 def get_project_for_cwd() -> tuple[str, ConfigStore, GitRepo]:
@@ -31,10 +67,15 @@ def get_project_for_cwd() -> tuple[str, ConfigStore, GitRepo]:
     Raises:
         ProjectNotRegisteredError: If cwd is not a registered project.
     """
+    from .config_store import ConfigStore
+    from .git_repo import GitRepo
+    from .project_store import ProjectStore
+
     repo = GitRepo()  # Uses cwd
     project_store = ProjectStore()
+    repo_root = os.path.realpath(repo.root)
     for project in project_store.list_projects():
-        if Path(project.path).resolve() == repo.root.resolve():
+        if os.path.realpath(project.path) == repo_root:
             store = ConfigStore(project.id)
             store.set_repo_root(repo.root)
             return project.id, store, repo
@@ -44,6 +85,8 @@ def get_project_for_cwd() -> tuple[str, ConfigStore, GitRepo]:
 
 def cmd_add(args: argparse.Namespace) -> int:
     """Add a new subscription."""
+    from .utils import SemanticTargetSpec, parse_target_spec
+
     try:
         _, store, repo = get_project_for_cwd()
         config = store.load()
@@ -68,6 +111,30 @@ def cmd_add(args: argparse.Namespace) -> int:
         return 1
 
 
+def _build_anchors(
+    lines: list[str], start_line: int, end_line: int, context: int
+) -> Anchor:
+    """Build anchors for a line range, skipping context extraction when context is 0."""
+    from .models import Anchor
+    from .utils import extract_anchors
+
+    if context == 0:
+        return Anchor(
+            context_before=[],
+            lines=lines[start_line - 1 : end_line],
+            context_after=[],
+        )
+
+    context_before, watched_lines, context_after = extract_anchors(
+        lines, start_line, end_line, context=context
+    )
+    return Anchor(
+        context_before=context_before,
+        lines=watched_lines,
+        context_after=context_after,
+    )
+
+
 def _add_line_subscription(
     store: ConfigStore,
     repo: GitRepo,
@@ -76,6 +143,8 @@ def _add_line_subscription(
     args: argparse.Namespace,
 ) -> int:
     """Add a line-based subscription."""
+    from .models import Subscription
+
     lines = repo.show_file(baseline, target.path)
 
     # Validate line range
@@ -88,14 +157,7 @@ def _add_line_subscription(
         return 1
 
     # Extract anchors
-    context_before, watched_lines, context_after = extract_anchors(
-        lines, target.start_line, target.end_line, context=args.context
-    )
-    anchors = Anchor(
-        context_before=context_before,
-        lines=watched_lines,
-        context_after=context_after,
-    )
+    anchors = _build_anchors(lines, target.start_line, target.end_line, args.context)
 
     # Create subscription
     sub = Subscription.create(
@@ -132,7 +194,7 @@ def _add_semantic_subscription(
 ) -> int:
     """Add a semantic subscription."""
     from .errors import UnsupportedLanguageError
-    from .models import CONTAINER_KINDS, MemberFingerprint
+    from .models import CONTAINER_KINDS, MemberFingerprint, SemanticTarget, Subscription
     from .semantic import get_indexer_for_path
 
     try:
@@ -192,14 +254,7 @@ def _add_semantic_subscription(
             )
 
     # Extract anchors from construct lines
-    context_before, watched_lines, context_after = extract_anchors(
-        lines, construct.start_line, construct.end_line, context=args.context
-    )
-    anchors = Anchor(
-        context_before=context_before,
-        lines=watched_lines,
-        context_after=context_after,
-    )
+    anchors = _build_anchors(lines, construct.start_line, construct.end_line, args.context)
 
     # Create semantic target with container flags
     semantic = SemanticTarget(
@@ -241,29 +296,52 @@ def _add_semantic_subscription(
     return 0
 
 
+def _print_json(data: Any) -> None:
+    """Print data as indented JSON, escaping non-ASCII if stdout can't encode it."""
+    from .utils import json_dumps
+
+    text = json_dumps(data)
+    try:
+        text.encode(getattr(sys.stdout, "encoding", None) or "utf-8")
+    except UnicodeEncodeError:
+        import json
+
+        text = json.dumps(data, indent=2)
+    print(text)
+
+
 def cmd_list(args: argparse.Namespace) -> int:
     """List all subscriptions."""
+    from .utils import format_subscription
+
     try:
         _, store, _ = get_project_for_cwd()
-        config = store.load()
+        show_all = args.all
 
-        subs = config.subscriptions
-        if not args.all:
-            subs = [s for s in subs if s.active]
+        if args.json:
+            # Stored dicts are already in output form; skip the models
+            raw = store.load_raw()
+            data = [
+                s for s in raw.get("subscriptions", [])
+                if show_all or s.get("active", True)
+            ]
+            if not data:
+                print("No subscriptions found.")
+                return 0
+            _print_json(data)
+            return 0
 
+        subs = store.list_subscriptions(include_inactive=show_all)
         if not subs:
             print("No subscriptions found.")
             return 0
 
-        if args.json:
-            data = [s.to_dict() for s in subs]
-            print(json.dumps(data, indent=2))
-        else:
-            print(f"Subscriptions ({len(subs)}):")
-            print(f"Baseline: {config.repo.baseline_ref[:12]}")
-            print()
-            for sub in subs:
-                print(format_subscription(sub, verbose=args.verbose))
+        print(f"Subscriptions ({len(subs)}):")
+        print(f"Baseline: {store.get_baseline()[:12]}")
+        print()
+        sys.stdout.write(
+            "".join(format_subscription(s, verbose=args.verbose) + "\n" for s in subs)
+        )
 
         return 0
 
@@ -295,13 +373,10 @@ def cmd_scan(args: argparse.Namespace) -> int:
     """Scan for changes and report triggered subscriptions."""
     try:
         _, store, repo = get_project_for_cwd()
-        config = store.load()
 
-        # Import detector here to avoid circular imports during module load
-        from .detector import Detector
-
-        # Resolve refs
-        base_ref = args.base or config.repo.baseline_ref
+        # Resolve refs first: when there is nothing to scan, the
+        # subscriptions never need to be loaded
+        base_ref = args.base or store.peek_baseline()
         target_ref = repo.resolve_ref(args.target or "HEAD")
         base_ref = repo.resolve_ref(base_ref)
 
@@ -309,15 +384,20 @@ def cmd_scan(args: argparse.Namespace) -> int:
             print("Base and target refs are the same. No changes to scan.")
             return 0
 
+        # Read-only shared objects are enough: the scan doesn't modify them
+        active_subs = store.list_subscriptions()
+
+        # Import detector here to avoid circular imports during module load
+        from .detector import Detector
+
         # Run detection
         detector = Detector(repo)
-        result = detector.scan(config.subscriptions, base_ref, target_ref)
+        result = detector.scan(active_subs, base_ref, target_ref)
 
         # Output results
         if args.json:
-            from .update_doc import result_to_dict
-            data = result_to_dict(result)
-            print(json.dumps(data, indent=2))
+            data = _get_update_doc_module().result_to_dict(result)
+            _print_json(data)
         else:
             print(f"Scan: {base_ref[:12]} -> {target_ref[:12]}")
             print()
@@ -358,13 +438,11 @@ def cmd_scan(args: argparse.Namespace) -> int:
 
         # Write update documents if requested
         if args.write_updates:
-            from .update_doc import write_update_doc
-            write_update_doc(result, args.write_updates)
+            _get_update_doc_module().write_update_doc(result, args.write_updates)
             print(f"Wrote update document: {args.write_updates}")
 
         if args.write_md:
-            from .update_doc import write_markdown_doc
-            write_markdown_doc(result, args.write_md)
+            _get_update_doc_module().write_markdown_doc(result, args.write_md)
             print(f"Wrote markdown summary: {args.write_md}")
 
         # Exit code
@@ -380,6 +458,8 @@ def cmd_scan(args: argparse.Namespace) -> int:
 
 def cmd_apply_updates(args: argparse.Namespace) -> int:
     """Apply update proposals from an update document."""
+    import json
+
     try:
         _, store, repo = get_project_for_cwd()
 
@@ -429,6 +509,10 @@ def cmd_apply_updates(args: argparse.Namespace) -> int:
 
 def cmd_projects_list(args: argparse.Namespace) -> int:
     """List registered projects."""
+    import json
+
+    from .project_store import ProjectStore
+
     try:
         store = ProjectStore()
         projects = store.list_projects()
@@ -458,6 +542,8 @@ def cmd_projects_list(args: argparse.Namespace) -> int:
 
 def cmd_projects_add(args: argparse.Namespace) -> int:
     """Add a project."""
+    from .project_store import ProjectStore
+
     try:
         store = ProjectStore()
         project = store.add_project(path=args.path, name=args.name)
@@ -476,6 +562,8 @@ def cmd_projects_add(args: argparse.Namespace) -> int:
 
 def cmd_projects_remove(args: argparse.Namespace) -> int:
     """Remove a project."""
+    from .project_store import ProjectStore
+
     try:
         store = ProjectStore()
         keep_data = getattr(args, 'keep_data', False)
@@ -494,6 +582,8 @@ def cmd_projects_remove(args: argparse.Namespace) -> int:
 
 def cmd_scan_history_clear(args: argparse.Namespace) -> int:
     """Clear scan history."""
+    from .scan_history import ScanHistory
+
     try:
         history = ScanHistory()
 
@@ -513,13 +603,14 @@ def cmd_scan_history_clear(args: argparse.Namespace) -> int:
 
 def cmd_symbols(args: argparse.Namespace) -> int:
     """List discoverable code constructs in a file."""
+    import json
+
     try:
         _, store, repo = get_project_for_cwd()
         config = store.load()
 
         ref = args.ref or config.repo.baseline_ref
-        lines = repo.show_file(ref, args.path)
-        source = "\n".join(lines)
+        source = repo.show_file_text(ref, args.path)
 
         from .errors import UnsupportedLanguageError
         from .semantic import get_indexer_for_path
@@ -532,13 +623,15 @@ def cmd_symbols(args: argparse.Namespace) -> int:
 
         constructs = indexer.index_file(source, args.path)
 
-        # Filter by kind if specified
-        if args.kind:
-            constructs = [c for c in constructs if c.kind == args.kind]
-
-        # Filter by grep pattern if specified
-        if args.grep:
-            constructs = [c for c in constructs if args.grep in c.qualname]
+        # Filter by kind and/or grep pattern in a single pass (skipped if neither set)
+        kind = args.kind
+        grep = args.grep
+        if kind and grep:
+            constructs = [c for c in constructs if c.kind == kind and grep in c.qualname]
+        elif kind:
+            constructs = [c for c in constructs if c.kind == kind]
+        elif grep:
+            constructs = [c for c in constructs if grep in c.qualname]
 
         if args.json:
             data = [
@@ -581,8 +674,18 @@ def cmd_symbols(args: argparse.Namespace) -> int:
 
 
 def cmd_serve(args: argparse.Namespace) -> int:
-    """Start the API server."""
+    """
+    Start the API server.
+
+    Without --reload the FastAPI app is imported here, which takes a few
+    hundred milliseconds; with --reload uvicorn imports it in the worker
+    process instead, so this process never loads it.
+    """
+    from .project_store import ProjectStore
+
     try:
+        # Heavy imports follow; let the user know something is happening
+        print("Loading server...", flush=True)
         import uvicorn
 
         project_store = ProjectStore()
@@ -613,169 +716,247 @@ def cmd_serve(args: argparse.Namespace) -> int:
         return 1
 
 
-def create_parser() -> argparse.ArgumentParser:
-    """Create the argument parser."""
-    parser = argparse.ArgumentParser(
-        prog="codesub",
-        description="Subscribe to file line ranges and detect changes via git diff.",
-    )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {__version__}"
-    )
+_DESCRIPTION = "Subscribe to file line ranges and detect changes via git diff."
+_HELP_COMMANDS = "Commands"
+_HELP_FLAG = "show this help message and exit"
 
-    subparsers = parser.add_subparsers(dest="command", help="Commands")
 
-    # add
-    add_parser = subparsers.add_parser("add", help="Add a new subscription")
-    add_parser.add_argument(
-        "location",
-        help="Location to subscribe to. Line-based: 'path:line' or 'path:start-end'. "
-        "Semantic: 'path::QualName' or 'path::kind:QualName'",
-    )
-    add_parser.add_argument("--label", "-l", help="Label for the subscription")
-    add_parser.add_argument("--desc", "-d", help="Description")
-    add_parser.add_argument(
-        "--context", "-c", type=int, default=2,
-        help="Number of context lines for anchors (default: 2)"
-    )
-    add_parser.add_argument(
-        "--trigger-on-duplicate",
-        action="store_true",
-        help="Trigger alert if construct is found in multiple files (default: no trigger)"
-    )
-    add_parser.add_argument(
-        "--include-members",
-        action="store_true",
-        help="Track all members of a container (class/enum). Triggers on any member change."
-    )
-    add_parser.add_argument(
-        "--include-private",
-        action="store_true",
-        help="Include private members (_prefixed) when using --include-members. Only affects Python."
-    )
-    add_parser.add_argument(
-        "--no-track-decorators",
-        action="store_true",
-        help="Disable tracking decorator changes (default: track decorators)"
-    )
+class _LazyHelp(argparse.Action):
+    """Shared -h/--help action for subcommand parsers.
 
-    # list
-    list_parser = subparsers.add_parser("list", help="List subscriptions")
-    list_parser.add_argument(
-        "--json", action="store_true", help="Output as JSON"
-    )
-    list_parser.add_argument(
-        "--verbose", "-v", action="store_true", help="Show detailed info including anchors"
-    )
-    list_parser.add_argument(
-        "--all", "-a", action="store_true", help="Include inactive subscriptions"
-    )
+    Help text is only formatted when the option is actually used.
+    """
 
-    # remove
-    remove_parser = subparsers.add_parser("remove", help="Remove a subscription")
-    remove_parser.add_argument("subscription_id", help="Subscription ID (or prefix)")
-    remove_parser.add_argument(
-        "--hard", action="store_true", help="Delete entirely (default: deactivate)"
-    )
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, default=argparse.SUPPRESS, help=None):
+        super().__init__(
+            option_strings=option_strings, dest=dest, default=default, nargs=0, help=help
+        )
 
-    # symbols
-    symbols_parser = subparsers.add_parser(
-        "symbols", help="List discoverable code constructs in a file"
-    )
-    symbols_parser.add_argument("path", help="File path to analyze")
-    symbols_parser.add_argument("--ref", help="Git ref (default: baseline)")
-    symbols_parser.add_argument(
-        "--kind",
-        choices=["variable", "field", "method", "function", "class", "interface", "enum"],
-        help="Filter by construct kind",
-    )
-    symbols_parser.add_argument("--grep", help="Filter by name pattern")
-    symbols_parser.add_argument("--json", action="store_true", help="Output as JSON")
+    def __call__(self, parser, namespace, values, option_string=None):
+        parser.print_help()
+        parser.exit()
 
-    # scan
-    scan_parser = subparsers.add_parser(
-        "scan", help="Scan for changes and report triggered subscriptions"
-    )
-    scan_parser.add_argument(
-        "--base", "-b", help="Base ref (default: config baseline)"
-    )
-    scan_parser.add_argument(
-        "--target", "-t", help="Target ref (default: HEAD)"
-    )
-    scan_parser.add_argument(
-        "--write-updates", "-w", help="Write JSON update document to path"
-    )
-    scan_parser.add_argument(
-        "--write-md", "-m", help="Write markdown summary to path"
-    )
-    scan_parser.add_argument(
-        "--json", action="store_true", help="Output as JSON"
-    )
-    scan_parser.add_argument(
-        "--fail-on-trigger", action="store_true",
-        help="Exit with code 2 if any subscriptions are triggered"
-    )
 
-    # apply-updates
-    apply_parser = subparsers.add_parser(
-        "apply-updates", help="Apply update proposals from an update document"
-    )
-    apply_parser.add_argument("update_doc", help="Path to update document JSON")
-    apply_parser.add_argument(
-        "--dry-run", action="store_true", help="Show what would be done without applying"
-    )
+def _add_parser(subparsers, name: str, **kwargs) -> argparse.ArgumentParser:
+    """Add a subcommand parser that uses the lightweight _LazyHelp action."""
+    sub = subparsers.add_parser(name, add_help=False, **kwargs)
+    sub.add_argument("-h", "--help", action=_LazyHelp, help=_HELP_FLAG)
+    return sub
 
-    # serve
-    serve_parser = subparsers.add_parser("serve", help="Start the API server")
-    serve_parser.add_argument(
-        "--host", default="127.0.0.1", help="Host to bind to (default: 127.0.0.1)"
-    )
-    serve_parser.add_argument(
-        "--port", "-p", type=int, default=8000, help="Port to bind to (default: 8000)"
-    )
-    serve_parser.add_argument(
-        "--reload", action="store_true", help="Enable auto-reload for development"
-    )
 
-    # projects (subcommand group)
-    projects_parser = subparsers.add_parser("projects", help="Manage registered projects")
-    projects_subparsers = projects_parser.add_subparsers(dest="projects_command")
-
-    # projects list
-    projects_list_parser = projects_subparsers.add_parser("list", help="List registered projects")
-    projects_list_parser.add_argument("--json", action="store_true", help="Output as JSON")
-
-    # projects add
-    projects_add_parser = projects_subparsers.add_parser("add", help="Add a project")
-    projects_add_parser.add_argument("path", help="Path to git repository")
-    projects_add_parser.add_argument("--name", "-n", help="Display name (defaults to dir name)")
-
-    # projects remove
-    projects_remove_parser = projects_subparsers.add_parser("remove", help="Remove a project")
-    projects_remove_parser.add_argument("project_id", help="Project ID")
-    projects_remove_parser.add_argument(
-        "--keep-data",
-        action="store_true",
-        help="Preserve subscription and scan history data after removing project"
-    )
+class _RootParser(argparse.ArgumentParser):
+    """Root parser that reports through the full parser when built partially.
+
+    A parser built for a single command lists only that command in its
+    usage, so help and errors are produced by a parser with every command.
+    """
+
+    partial = False
 
-    # scan-history
-    scan_history_parser = subparsers.add_parser("scan-history", help="Manage scan history")
-    scan_history_subparsers = scan_history_parser.add_subparsers(dest="scan_history_command")
+    def format_help(self) -> str:
+        if self.partial:
+            return create_parser().format_help()
+        return super().format_help()
 
-    # scan-history clear
-    scan_history_clear_parser = scan_history_subparsers.add_parser("clear", help="Clear scan history")
-    scan_history_clear_parser.add_argument(
-        "--project", "-p", help="Clear only for specific project ID"
+    def error(self, message: str):
+        if self.partial:
+            create_parser().error(message)
+        super().error(message)
+
+
+def _make_root(partial: bool = False) -> tuple[argparse.ArgumentParser, Any]:
+    """Create the root parser and its subcommand action."""
+    parser = _RootParser(
+        prog="codesub",
+        description=_DESCRIPTION,
     )
+    parser.partial = partial
+    parser.add_argument(
+        "--version", "-V", action="version", version=f"%(prog)s {__version__}"
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help=_HELP_COMMANDS)
+    return parser, subparsers
+
+
+# Subcommand help, keyed by command name ("group sub" for nested commands)
+_HELP = {
+    "add": "Add a new subscription",
+    "list": "List subscriptions",
+    "remove": "Remove a subscription",
+    "symbols": "List discoverable code constructs in a file",
+    "scan": "Scan for changes and report triggered subscriptions",
+    "apply-updates": "Apply update proposals from an update document",
+    "serve": "Start the API server",
+    "projects": "Manage registered projects",
+    "projects list": "List registered projects",
+    "projects add": "Add a project",
+    "projects remove": "Remove a project",
+    "scan-history": "Manage scan history",
+    "scan-history clear": "Clear scan history",
+}
+
+# add_argument() calls per command, as (args, kwargs) pairs
+_SPECS: dict[str, list[tuple[tuple[str, ...], dict[str, Any]]]] = {
+    "add": [
+        (("location",), {
+            "help": "Location to subscribe to. Line-based: 'path:line' or 'path:start-end'. "
+            "Semantic: 'path::QualName' or 'path::kind:QualName'",
+        }),
+        (("--label", "-l"), {"help": "Label for the subscription"}),
+        (("--desc", "-d"), {"help": "Description"}),
+        (("--context", "-c"), {
+            "type": int, "default": 2,
+            "help": "Number of context lines for anchors (default: 2)",
+        }),
+        (("--trigger-on-duplicate",), {
+            "action": "store_true",
+            "help": "Trigger alert if construct is found in multiple files (default: no trigger)",
+        }),
+        (("--include-members",), {
+            "action": "store_true",
+            "help": "Track all members of a container (class/enum). Triggers on any member change.",
+        }),
+        (("--include-private",), {
+            "action": "store_true",
+            "help": "Include private members (_prefixed) when using --include-members. Only affects Python.",
+        }),
+        (("--no-track-decorators",), {
+            "action": "store_true",
+            "help": "Disable tracking decorator changes (default: track decorators)",
+        }),
+    ],
+    "list": [
+        (("--json",), {"action": "store_true", "help": "Output as JSON"}),
+        (("--verbose", "-v"), {
+            "action": "store_true", "help": "Show detailed info including anchors",
+        }),
+        (("--all", "-a"), {"action": "store_true", "help": "Include inactive subscriptions"}),
+    ],
+    "remove": [
+        (("subscription_id",), {"help": "Subscription ID (or prefix)"}),
+        (("--hard",), {
+            "action": "store_true", "help": "Delete entirely (default: deactivate)",
+        }),
+    ],
+    "symbols": [
+        (("path",), {"help": "File path to analyze"}),
+        (("--ref",), {"help": "Git ref (default: baseline)"}),
+        (("--kind",), {
+            "choices": ["variable", "field", "method", "function", "class", "interface", "enum"],
+            "help": "Filter by construct kind",
+        }),
+        (("--grep",), {"help": "Filter by name pattern"}),
+        (("--json",), {"action": "store_true", "help": "Output as JSON"}),
+    ],
+    "scan": [
+        (("--base", "-b"), {"help": "Base ref (default: config baseline)"}),
+        (("--target", "-t"), {"help": "Target ref (default: HEAD)"}),
+        (("--write-updates", "-w"), {"help": "Write JSON update document to path"}),
+        (("--write-md", "-m"), {"help": "Write markdown summary to path"}),
+        (("--json",), {"action": "store_true", "help": "Output as JSON"}),
+        (("--fail-on-trigger",), {
+            "action": "store_true",
+            "help": "Exit with code 2 if any subscriptions are triggered",
+        }),
+    ],
+    "apply-updates": [
+        (("update_doc",), {"help": "Path to update document JSON"}),
+        (("--dry-run",), {
+            "action": "store_true", "help": "Show what would be done without applying",
+        }),
+    ],
+    "serve": [
+        (("--host",), {"default": "127.0.0.1", "help": "Host to bind to (default: 127.0.0.1)"}),
+        (("--port", "-p"), {
+            "type": int, "default": 8000, "help": "Port to bind to (default: 8000)",
+        }),
+        (("--reload",), {"action": "store_true", "help": "Enable auto-reload for development"}),
+    ],
+    "projects list": [
+        (("--json",), {"action": "store_true", "help": "Output as JSON"}),
+    ],
+    "projects add": [
+        (("path",), {"help": "Path to git repository"}),
+        (("--name", "-n"), {"help": "Display name (defaults to dir name)"}),
+    ],
+    "projects remove": [
+        (("project_id",), {"help": "Project ID"}),
+        (("--keep-data",), {
+            "action": "store_true",
+            "help": "Preserve subscription and scan history data after removing project",
+        }),
+    ],
+    "scan-history clear": [
+        (("--project", "-p"), {"help": "Clear only for specific project ID"}),
+    ],
+}
+
+# Command groups: name -> (dest for the chosen subcommand, (name, key) pairs)
+_GROUPS = {
+    "projects": ("projects_command", (
+        ("list", "projects list"),
+        ("add", "projects add"),
+        ("remove", "projects remove"),
+    )),
+    "scan-history": ("scan_history_command", (("clear", "scan-history clear"),)),
+}
+
+# Top-level commands, in help order
+_COMMANDS = (
+    "add", "list", "remove", "symbols", "scan", "apply-updates", "serve",
+    "projects", "scan-history",
+)
+
+
+def _build(subparsers, name: str, key: str | None = None) -> argparse.ArgumentParser:
+    """Add the subcommand parser for name (spec key defaults to name)."""
+    key = key or name
+    sub = _add_parser(subparsers, name, help=_HELP[key])
+    for args, kwargs in _SPECS.get(key, ()):
+        sub.add_argument(*args, **kwargs)
+
+    group = _GROUPS.get(key)
+    if group is not None:
+        dest, children = group
+        group_subparsers = sub.add_subparsers(dest=dest)
+        sub.set_defaults(**{dest: None}, group_parser=sub)
+        for child, child_key in children:
+            _build(group_subparsers, child, child_key)
+    return sub
 
+
+def create_parser(command: str | None = None) -> argparse.ArgumentParser:
+    """
+    Create the argument parser.
+
+    Args:
+        command: If a known subcommand, only that subparser is built.
+            Otherwise all subparsers are built. Root help and errors always
+            come from the full parser, so they list every command.
+    """
+    partial = command in _COMMANDS
+    parser, subparsers = _make_root(partial)
+    for name in (command,) if partial else _COMMANDS:
+        _build(subparsers, name)
     return parser
 
 
 def main() -> int:
     """Main entry point."""
-    parser = create_parser()
-    args = parser.parse_args()
+    # Fast path: answer version/help queries without building the parser
+    argv = sys.argv[1:]
+    if len(argv) == 1 and argv[0] in ("--version", "-V"):
+        print(f"codesub {__version__}")
+        return 0
+    if not argv or (len(argv) == 1 and argv[0] in ("--help", "-h")):
+        sys.stdout.write(_ROOT_HELP)
+        return 0
+
+    # Build only the invoked command's parser when it comes first; root
+    # options before it (e.g. "-h add") need the full parser
+    parser = create_parser(argv[0] if argv[0] in _COMMANDS else None)
+    args = parser.parse_args(argv)
 
     if not args.command:
         parser.print_help()
@@ -783,8 +964,8 @@ def main() -> int:
 
     # Handle projects subcommands
     if args.command == "projects":
-        if not hasattr(args, "projects_command") or not args.projects_command:
-            parser.parse_args(["projects", "--help"])
+        if not args.projects_command:
+            args.group_parser.print_help()
             return 0
         if args.projects_command == "list":
             return cmd_projects_list(args)
@@ -795,8 +976,8 @@ def main() -> int:
 
     # Handle scan-history subcommands
     if args.command == "scan-history":
-        if not hasattr(args, "scan_history_command") or not args.scan_history_command:
-            parser.parse_args(["scan-history", "--help"])
+        if not args.scan_history_command:
+            args.group_parser.print_help()
             return 0
         if args.scan_history_command == "clear":
             return cmd_scan_history_clear(args)
@@ -1,10 +1,13 @@
 """Configuration storage for codesub."""
 
-import json
+import bisect
+import contextlib
 import os
+import re
 import shutil
-import tempfile
+import threading
 from pathlib import Path
+from typing import Any, BinaryIO, Iterator
 
 from .errors import (
     ConfigExistsError,
@@ -13,8 +16,7 @@ from .errors import (
     SubscriptionNotFoundError,
 )
 from .models import Config, Subscription, _utc_now
-
-import os
+from .utils import json_dumps, json_dumps_bytes, json_loads
 
 SCHEMA_VERSION = 1
 
@@ -29,10 +31,75 @@ UPDATE_DOCS_DIR = "last_update_docs"
 # Legacy storage constants (for migration)
 LEGACY_CONFIG_DIR = ".codesub"
 
+# peek_baseline() looks for the baseline ref in this many leading bytes
+_PEEK_BYTES = 512
+_BASELINE_RE = re.compile(rb'"baseline_ref":\s*("(?:[^"\\]|\\.)*")')
+
+# Configs with more subscriptions than this are written one entry at a time
+STREAM_WRITE_THRESHOLD = 500
+
+
+def _write_streaming(f: BinaryIO, data: dict[str, Any]) -> None:
+    """
+    Write config data to f one subscription at a time.
+
+    Produces the same bytes as json_dumps_bytes(data) without building the
+    whole document in memory first. Expects "subscriptions" to be the last
+    key, as in Config.to_dict().
+    """
+    subs = data["subscriptions"]
+    head = json_dumps({k: v for k, v in data.items() if k != "subscriptions"})
+    f.write(head[:-2].encode("utf-8"))  # drop the closing "\n}"
+    if not subs:
+        f.write(b',\n  "subscriptions": []\n}\n')
+        return
+    f.write(b',\n  "subscriptions": [')
+    for i, sub in enumerate(subs):
+        f.write(b",\n    " if i else b"\n    ")
+        f.write(json_dumps(sub).replace("\n", "\n    ").encode("utf-8"))
+    f.write(b"\n  ]\n}\n")
+
+
+class _CachedConfig:
+    """
+    Parsed contents of a config file, shared by reads of the unchanged file.
+
+    The raw dict is never handed out. Subscription objects are built on
+    first access and reused by later read-only calls.
+    """
+
+    __slots__ = ("key", "data", "_subscriptions", "_active")
+
+    def __init__(self, key: tuple[int, int], data: dict[str, Any]):
+        self.key = key  # (mtime_ns, size) of the file this was read from
+        self.data = data
+        self._subscriptions: list[Subscription] | None = None
+        self._active: list[Subscription] | None = None
+
+    @property
+    def subscriptions(self) -> list[Subscription]:
+        if self._subscriptions is None:
+            self._subscriptions = [
+                Subscription.from_dict(s) for s in self.data.get("subscriptions", [])
+            ]
+        return self._subscriptions
+
+    @property
+    def active(self) -> list[Subscription]:
+        """Active subscriptions, filtered once per file version."""
+        if self._active is None:
+            self._active = [s for s in self.subscriptions if s.active]
+        return self._active
+
 
 class ConfigStore:
     """Manages reading and writing the subscription configuration."""
 
+    # (config_dir, repo_root) pairs whose migration state is settled in this
+    # process: the config exists (migrated or initialized), so there is
+    # nothing left to probe on later set_repo_root() calls.
+    _migration_checked: set[tuple[str, Path]] = set()
+
     def __init__(self, project_id: str, config_dir: Path | None = None):
         """
         Initialize ConfigStore.
@@ -43,10 +110,30 @@ class ConfigStore:
         """
         self.project_id = project_id
         self._base_dir = config_dir or DATA_DIR
-        self.config_dir = self._base_dir / SUBSCRIPTIONS_DIR / project_id
-        self.config_path = self.config_dir / CONFIG_FILE
-        self.update_docs_dir = self.config_dir / UPDATE_DOCS_DIR
+        # Plain strings for the hot paths; Path views are built on demand
+        self._config_dir = os.path.join(self._base_dir, SUBSCRIPTIONS_DIR, project_id)
+        self._config_file = os.path.join(self._config_dir, CONFIG_FILE)
         self._repo_root: Path | None = None
+        # Contents of the last loaded/saved config file
+        self._cache: _CachedConfig | None = None
+        # Sorted subscription IDs of the cached config, their list positions,
+        # and an exact ID -> position map
+        self._id_index: tuple[list[str], list[int], dict[str, int]] | None = None
+
+    @property
+    def config_dir(self) -> Path:
+        """Directory holding this project's config and update docs."""
+        return Path(self._config_dir)
+
+    @property
+    def config_path(self) -> Path:
+        """Path of the subscriptions config file."""
+        return Path(self._config_file)
+
+    @property
+    def update_docs_dir(self) -> Path:
+        """Directory for saved update documents."""
+        return Path(self._config_dir, UPDATE_DOCS_DIR)
 
     def set_repo_root(self, repo_root: Path) -> None:
         """
@@ -55,7 +142,11 @@ class ConfigStore:
         This triggers auto-migration from legacy .codesub/ location if needed.
         """
         self._repo_root = repo_root
-        self._try_migrate(repo_root)
+        key = (self._config_dir, repo_root)
+        if key in ConfigStore._migration_checked:
+            return
+        if os.path.exists(self._config_file) or self._try_migrate(repo_root):
+            ConfigStore._migration_checked.add(key)
 
     def _get_legacy_path(self, repo_root: Path) -> Path:
         """Get legacy .codesub config path for migration."""
@@ -67,7 +158,7 @@ class ConfigStore:
 
         Returns True if migration occurred, False otherwise.
         """
-        if self.config_path.exists():
+        if os.path.exists(self._config_file):
             return False  # Already migrated or initialized
 
         legacy_path = self._get_legacy_path(repo_root)
@@ -89,50 +180,102 @@ class ConfigStore:
 
     def exists(self) -> bool:
         """Check if config file exists."""
-        return self.config_path.exists()
+        return os.path.exists(self._config_file)
 
-    def load(self) -> Config:
+    def _snapshot(self) -> _CachedConfig:
         """
-        Load configuration from disk.
+        Return the parsed config file, re-reading it only when it changed.
+
+        The cache is keyed by the file's (mtime_ns, size), so repeated reads
+        of an unchanged file skip the JSON parse.
 
         Raises:
             ConfigNotFoundError: If config doesn't exist.
             InvalidSchemaVersionError: If schema version is unsupported.
         """
-        if not self.exists():
-            raise ConfigNotFoundError(str(self.config_path))
+        try:
+            st = os.stat(self._config_file)
+        except FileNotFoundError:
+            raise ConfigNotFoundError(self._config_file) from None
+
+        key = (st.st_mtime_ns, st.st_size)
+        if self._cache is not None and self._cache.key == key:
+            return self._cache
 
-        with open(self.config_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(self._config_file, "rb") as f:
+            data = json_loads(f.read())
 
         version = data.get("schema_version", 0)
         if version != SCHEMA_VERSION:
             raise InvalidSchemaVersionError(version, SCHEMA_VERSION)
 
-        return Config.from_dict(data)
+        self._cache = _CachedConfig(key, data)
+        self._id_index = None
+        return self._cache
+
+    def load(self) -> Config:
+        """
+        Load configuration from disk.
+
+        Callers always receive a fresh Config and may mutate it freely.
+
+        Raises:
+            ConfigNotFoundError: If config doesn't exist.
+            InvalidSchemaVersionError: If schema version is unsupported.
+        """
+        return Config.from_dict(self._snapshot().data)
+
+    def load_raw(self) -> dict[str, Any]:
+        """
+        Load the parsed config JSON without building model objects.
+
+        The dict is shared with the load cache and must not be modified.
+
+        Raises:
+            ConfigNotFoundError: If config doesn't exist.
+            InvalidSchemaVersionError: If schema version is unsupported.
+        """
+        return self._snapshot().data
 
     def save(self, config: Config) -> None:
         """
         Save configuration to disk atomically.
 
-        Uses write-to-temp-then-rename for atomicity.
+        Uses write-to-temp-then-rename for atomicity, and fsyncs the file
+        and its directory so the new config survives a crash.
         """
-        # Ensure config directory exists
-        self.config_dir.mkdir(parents=True, exist_ok=True)
-
         # Update the updated_at timestamp
         config.repo.updated_at = _utc_now()
 
-        # Write to temp file then rename (atomic on POSIX)
         data = config.to_dict()
-        fd, temp_path = tempfile.mkstemp(
-            dir=self.config_dir, prefix=".subscriptions_", suffix=".tmp"
+        self._cache = None
+        self._id_index = None
+        self._atomic_write(data)
+        st = os.stat(self._config_file)
+        self._cache = _CachedConfig((st.st_mtime_ns, st.st_size), data)
+
+    def _atomic_write(self, data: dict[str, Any]) -> None:
+        """Write config data to a temp file and rename it over the config."""
+        # Ensure config directory exists
+        os.makedirs(self._config_dir, exist_ok=True)
+
+        # Write to temp file then rename (atomic on POSIX). The name only
+        # needs to be unique among concurrent writers, i.e. per process and
+        # thread, so no random name generation is needed.
+        temp_path = os.path.join(
+            self._config_dir,
+            f".{CONFIG_FILE}.{os.getpid()}.{threading.get_ident()}.tmp",
         )
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
         try:
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-                f.write("\n")  # trailing newline
-            os.replace(temp_path, self.config_path)
+            with os.fdopen(fd, "wb") as f:
+                if len(data["subscriptions"]) > STREAM_WRITE_THRESHOLD:
+                    _write_streaming(f, data)
+                else:
+                    f.write(json_dumps_bytes(data))  # includes trailing newline
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self._config_file)
         except Exception:
             # Clean up temp file on failure (ignore errors if already removed)
             try:
@@ -141,6 +284,61 @@ class ConfigStore:
                 pass
             raise
 
+        # Persist the rename itself (directories can't be opened on Windows)
+        if hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(self._config_dir, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    def _match_prefix(self, sub_id: str) -> list[int]:
+        """
+        Find subscriptions whose ID starts with sub_id.
+
+        A complete ID always resolves to just its own subscription.
+
+        Must be called right after load() or _snapshot(): positions refer to
+        the cached file contents, which have the same subscription order as
+        a loaded Config.
+
+        Returns:
+            Positions in config.subscriptions of all matches.
+        """
+        assert self._cache is not None
+        if self._id_index is None:
+            subs = self._cache.data.get("subscriptions", [])
+            order = sorted(range(len(subs)), key=lambda i: subs[i]["id"])
+            exact = {s["id"]: i for i, s in enumerate(subs)}
+            self._id_index = ([subs[i]["id"] for i in order], order, exact)
+
+        ids, order, exact = self._id_index
+        pos = exact.get(sub_id)
+        if pos is not None:
+            return [pos]
+        # IDs are ASCII, so every ID with this prefix sorts below prefix + U+FFFF
+        lo = bisect.bisect_left(ids, sub_id)
+        hi = bisect.bisect_left(ids, sub_id + "\uffff", lo)
+        return order[lo:hi]
+
+    def _find_unique(self, sub_id: str) -> int:
+        """
+        Resolve an ID (or prefix) to a single subscription position.
+
+        Same calling rules as _match_prefix().
+
+        Raises:
+            SubscriptionNotFoundError: If nothing or more than one matches.
+        """
+        matches = self._match_prefix(sub_id)
+        if not matches:
+            raise SubscriptionNotFoundError(sub_id)
+        if len(matches) > 1:
+            raise SubscriptionNotFoundError(
+                f"{sub_id} (ambiguous, matches {len(matches)} subscriptions)"
+            )
+        return matches[0]
+
     def init(self, baseline_ref: str, force: bool = False) -> Config:
         """
         Initialize a new configuration.
@@ -158,7 +356,7 @@ class ConfigStore:
             ConfigExistsError: If config exists and force=False.
         """
         if self.exists() and not force:
-            raise ConfigExistsError(str(self.config_path))
+            raise ConfigExistsError(self._config_file)
 
         config = Config.create(baseline_ref)
         self.save(config)
@@ -168,23 +366,42 @@ class ConfigStore:
 
         return config
 
-    def add_subscription(self, sub: Subscription) -> None:
-        """Add a subscription to the config."""
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[Config]:
+        """
+        Load the config once, yield it for changes, and save it once.
+
+        Use for bulk edits so N changes cost one parse and one write. If the
+        block raises, nothing is written.
+
+        Example:
+            with store.transaction() as config:
+                config.subscriptions.extend(new_subs)
+        """
         config = self.load()
-        config.subscriptions.append(sub)
+        yield config
         self.save(config)
 
+    def add_subscription(self, sub: Subscription) -> None:
+        """Add a subscription to the config."""
+        with self.transaction() as config:
+            config.subscriptions.append(sub)
+
     def list_subscriptions(self, include_inactive: bool = False) -> list[Subscription]:
         """
         List all subscriptions.
 
+        The returned objects are shared between calls while the file is
+        unchanged; treat them as read-only and use get_subscription() or
+        load() to obtain copies for modification.
+
         Args:
             include_inactive: If True, include inactive subscriptions.
         """
-        config = self.load()
+        snapshot = self._snapshot()
         if include_inactive:
-            return config.subscriptions
-        return [s for s in config.subscriptions if s.active]
+            return list(snapshot.subscriptions)
+        return list(snapshot.active)
 
     def get_subscription(self, sub_id: str) -> Subscription:
         """
@@ -193,17 +410,9 @@ class ConfigStore:
         Raises:
             SubscriptionNotFoundError: If subscription doesn't exist.
         """
-        config = self.load()
-        matches = [s for s in config.subscriptions if s.id.startswith(sub_id)]
-
-        if not matches:
-            raise SubscriptionNotFoundError(sub_id)
-        if len(matches) > 1:
-            raise SubscriptionNotFoundError(
-                f"{sub_id} (ambiguous, matches {len(matches)} subscriptions)"
-            )
-
-        return matches[0]
+        snapshot = self._snapshot()
+        idx = self._find_unique(sub_id)
+        return Subscription.from_dict(snapshot.data["subscriptions"][idx])
 
     def remove_subscription(self, sub_id: str, hard: bool = False) -> Subscription:
         """
@@ -219,25 +428,20 @@ class ConfigStore:
         Raises:
             SubscriptionNotFoundError: If subscription doesn't exist.
         """
-        config = self.load()
-        matches = [(i, s) for i, s in enumerate(config.subscriptions) if s.id.startswith(sub_id)]
-
-        if not matches:
-            raise SubscriptionNotFoundError(sub_id)
-        if len(matches) > 1:
-            raise SubscriptionNotFoundError(
-                f"{sub_id} (ambiguous, matches {len(matches)} subscriptions)"
-            )
-
-        idx, sub = matches[0]
-
-        if hard:
-            config.subscriptions.pop(idx)
-        else:
-            sub.active = False
-            sub.updated_at = _utc_now()
-
-        self.save(config)
+        stored = self._snapshot().data["subscriptions"]
+        idx = self._find_unique(sub_id)
+        if not hard and not stored[idx].get("active", True):
+            # Already deactivated, nothing to write
+            return Subscription.from_dict(stored[idx])
+
+        with self.transaction() as config:
+            idx = self._find_unique(sub_id)  # positions of this load
+            if hard:
+                sub = config.subscriptions.pop(idx)
+            else:
+                sub = config.subscriptions[idx]
+                sub.active = False
+                sub.updated_at = _utc_now()
         return sub
 
     def update_subscription(self, sub: Subscription) -> None:
@@ -247,23 +451,85 @@ class ConfigStore:
         Raises:
             SubscriptionNotFoundError: If subscription doesn't exist.
         """
-        config = self.load()
-        for i, existing in enumerate(config.subscriptions):
-            if existing.id == sub.id:
-                sub.updated_at = _utc_now()
-                config.subscriptions[i] = sub
-                self.save(config)
-                return
+        self.update_many([sub])
 
-        raise SubscriptionNotFoundError(sub.id)
+    def update_many(
+        self, subs: list[Subscription], baseline_ref: str | None = None
+    ) -> None:
+        """
+        Replace several existing subscriptions with a single load/save cycle.
+
+        Subscriptions identical to their stored form are left untouched
+        (including updated_at); if nothing changes, no write happens.
+
+        Args:
+            subs: Updated subscriptions (matched by exact ID).
+            baseline_ref: If given, also set the baseline ref in the same save.
+
+        Raises:
+            SubscriptionNotFoundError: If any subscription doesn't exist
+                (nothing is written in that case).
+        """
+        snapshot = self._snapshot()
+        stored = snapshot.data.get("subscriptions", [])
+        index_by_id = {s["id"]: i for i, s in enumerate(stored)}
+
+        changed: list[tuple[int, Subscription]] = []
+        for sub in subs:
+            i = index_by_id.get(sub.id)
+            if i is None:
+                raise SubscriptionNotFoundError(sub.id)
+            if sub.to_dict() != stored[i]:
+                changed.append((i, sub))
+
+        baseline_changed = (
+            baseline_ref is not None
+            and baseline_ref != snapshot.data["repo"]["baseline_ref"]
+        )
+        if not changed and not baseline_changed:
+            return
+
+        config = Config.from_dict(snapshot.data)
+        now = _utc_now()
+        for i, sub in changed:
+            sub.updated_at = now
+            config.subscriptions[i] = sub
+        if baseline_changed:
+            config.repo.baseline_ref = baseline_ref
 
-    def update_baseline(self, new_ref: str) -> None:
-        """Update the baseline ref."""
-        config = self.load()
-        config.repo.baseline_ref = new_ref
         self.save(config)
 
+    def update_baseline(self, new_ref: str) -> None:
+        """Update the baseline ref (no write if it is already new_ref)."""
+        if self.get_baseline() == new_ref:
+            return
+        with self.transaction() as config:
+            config.repo.baseline_ref = new_ref
+
     def get_baseline(self) -> str:
         """Get the current baseline ref."""
-        config = self.load()
-        return config.repo.baseline_ref
+        return self._snapshot().data["repo"]["baseline_ref"]
+
+    def peek_baseline(self) -> str:
+        """
+        Get the current baseline ref without parsing the whole config.
+
+        The ref sits near the top of the file, so only the first few hundred
+        bytes are read. Falls back to get_baseline() if it isn't found there
+        or the config is already cached.
+
+        Raises:
+            ConfigNotFoundError: If config doesn't exist.
+        """
+        if self._cache is not None:
+            return self.get_baseline()
+        try:
+            with open(self._config_file, "rb") as f:
+                head = f.read(_PEEK_BYTES)
+        except FileNotFoundError:
+            raise ConfigNotFoundError(self._config_file) from None
+
+        m = _BASELINE_RE.search(head)
+        if m is None:
+            return self.get_baseline()
+        return json_loads(m.group(1))
@@ -1,8 +1,13 @@
 """Change detection for codesub."""
 
+import os
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
 from typing import TYPE_CHECKING, Any
 
+from ._parse_cache import get_or_index
 from .diff_parser import DiffParser, ranges_overlap
+from .errors import FileNotFoundAtRefError, UnsupportedLanguageError
 from .git_repo import GitRepo
 from .models import (
     FileDiff,
@@ -14,18 +19,94 @@ from .models import (
     Subscription,
     Trigger,
 )
+from .semantic import (
+    InheritanceResolver,
+    get_indexer,
+    get_member_id,
+    get_overridden_members,
+    language_for_path,
+)
 
 if TYPE_CHECKING:
     from .semantic import Construct
     from .semantic.indexer_protocol import SemanticIndexer
 
 
+class _HunkIndex:
+    """Hunks of one file, with their old-side bounds.
+
+    Built once per changed file and shared by every subscription on it.
+    Hunks must be in ascending old_start order, as DiffParser.parse_patch
+    returns them.
+    """
+
+    __slots__ = ("hunks", "starts", "ends", "cum_delta")
+
+    def __init__(self, hunks: list[Hunk]):
+        self.hunks = hunks
+        self.starts = [h.old_start for h in self.hunks]
+        # Last old line touched; old_start - 1 for pure insertions
+        self.ends = [h.old_start + h.old_count - 1 for h in self.hunks]
+        # cum_delta[i]: net line count change of the first i hunks
+        self.cum_delta = [0, *accumulate(h.new_count - h.old_count for h in self.hunks)]
+
+
+class _ConstructIndex:
+    """Lookup tables over the constructs of one indexed file.
+
+    Built once per file during a scan and shared by every subscription
+    that resolves against it.
+    """
+
+    __slots__ = ("constructs", "by_qualname", "by_body", "by_interface", "by_container")
+
+    def __init__(self, constructs: "list[Construct]"):
+        self.constructs = constructs
+        self.by_qualname: dict[tuple[str, str], list[Construct]] = {}
+        # (kind, hash) -> constructs, in file order
+        self.by_body: dict[tuple[str, str], list[Construct]] = {}
+        self.by_interface: dict[tuple[str, str], list[Construct]] = {}
+        # Container qualname -> direct members (everything up to the last dot)
+        self.by_container: dict[str, list[Construct]] = {}
+        for c in constructs:
+            self.by_qualname.setdefault((c.qualname, c.kind), []).append(c)
+            self.by_body.setdefault((c.kind, c.body_hash), []).append(c)
+            self.by_interface.setdefault((c.kind, c.interface_hash), []).append(c)
+            container, dot, _name = c.qualname.rpartition(".")
+            if dot:
+                self.by_container.setdefault(container, []).append(c)
+
+    def hash_matches(
+        self, semantic: SemanticTarget
+    ) -> "tuple[list[Construct], list[Construct], list[Construct]]":
+        """Return (exact, body, interface) matches for a target's fingerprints.
+
+        Body and interface matches are of the same kind and include the
+        exact matches.
+        """
+        body = self.by_body.get((semantic.kind, semantic.body_hash), [])
+        interface = self.by_interface.get((semantic.kind, semantic.interface_hash), [])
+        exact = [c for c in body if c.interface_hash == semantic.interface_hash]
+        return exact, body, interface
+
+
 class Detector:
     """Detects changes affecting subscriptions."""
 
     def __init__(self, repo: GitRepo):
         self.repo = repo
         self.parser = DiffParser()
+        # File contents read during the current scan: (ref, path) -> text,
+        # or None if the file couldn't be read. Reset by scan().
+        self._source_cache: dict[tuple[str, str], str | None] = {}
+        # Lookup tables for construct_cache entries, under the same keys
+        self._construct_indexes: dict[tuple[str, str], _ConstructIndex] = {}
+        # Repository root as a string, for working-directory reads
+        self._root_dir = ""
+        # Last parsed diff: (patch text, file diffs, rename map, status map)
+        self._parsed_diff: tuple[
+            str, list[FileDiff], dict[str, str], dict[str, str]
+        ] | None = None
 
     def scan(
         self,
@@ -46,6 +127,8 @@ class Detector:
         """
         # Only process active subscriptions
         active_subs = [s for s in subscriptions if s.active]
+        self._source_cache = {}
+        self._construct_indexes = {}
 
         # Use "WORKING" to represent working directory
         display_target = target_ref or "WORKING"
@@ -58,19 +141,67 @@ class Detector:
                 proposals=[],
                 unchanged=[],
             )
+        self._root_dir = str(self.repo.root)
 
-        # Get diffs
+        # Split subs once: line-based ones by path, so each changed file is
+        # resolved once, and semantic ones by file, so each file is read and
+        # indexed once while its subscriptions are checked
+        line_subs_by_path: dict[str, list[Subscription]] = {}
+        semantic_subs_by_file: dict[tuple[str, str], list[Subscription]] = {}
+        for sub in active_subs:
+            if sub.semantic is None:
+                line_subs_by_path.setdefault(sub.path, []).append(sub)
+            else:
+                semantic_subs_by_file.setdefault(
+                    (sub.path, sub.semantic.language), []
+                ).append(sub)
+
+        # Get and parse the diff; renames and deletions come from its headers
         patch_text = self.repo.diff_patch(base_ref, target_ref)
-        name_status_text = self.repo.diff_name_status(base_ref, target_ref)
+        if not patch_text and not semantic_subs_by_file:
+            # Nothing changed (for the working tree this includes deletions).
+            # Semantic subs still go through their checks, which also report
+            # targets that can't be resolved at all.
+            return ScanResult(
+                base_ref=base_ref,
+                target_ref=display_target,
+                triggers=[],
+                proposals=[],
+                unchanged=active_subs,
+            )
+        file_diffs, rename_map, status_map = self._parse_diff(patch_text)
 
-        # Parse diffs
-        file_diffs = self.parser.parse_patch(patch_text)
-        rename_map, status_map = self.parser.parse_name_status(name_status_text)
+        # Resolve each watched path once: old path -> (new path, is deleted)
+        path_info: dict[str, tuple[str, bool]] = {}
+        for sub in active_subs:
+            if sub.path not in path_info:
+                path_info[sub.path] = (
+                    rename_map.get(sub.path, sub.path),
+                    status_map.get(sub.path) == "D",
+                )
 
-        # Build lookup by old path
-        diff_by_path: dict[str, FileDiff] = {}
-        for fd in file_diffs:
-            diff_by_path[fd.old_path] = fd
+        # Build lookup by old path, limited to files line-based subs watch
+        # (semantic subs work from file_diffs directly)
+        diff_by_path: dict[str, FileDiff] = {
+            fd.old_path: fd for fd in file_diffs if fd.old_path in line_subs_by_path
+        }
+
+        # Trigger, proposal or None for each line-based sub (keyed by id())
+        line_results: dict[int, Trigger | Proposal | None] = {}
+        for path, subs in line_subs_by_path.items():
+            # Check if file was renamed or deleted
+            new_path, is_deleted = path_info[path]
+            is_renamed = new_path != path
+
+            # Get diff for this file
+            file_diff = diff_by_path.get(path)
+            index = _HunkIndex(file_diff.hunks) if file_diff is not None else None
+
+            for sub in subs:
+                # Check for triggers, then for proposals (shift or rename)
+                line_results[id(sub)] = self._check_trigger(
+                    sub, file_diff, is_deleted, index
+                ) or self._compute_proposal(sub, index, is_renamed, new_path)
 
         triggers: list[Trigger] = []
         proposals: list[Proposal] = []
@@ -80,13 +211,28 @@ class Detector:
         # Avoids re-parsing the same file for multiple subscriptions
         construct_cache: dict[tuple[str, str], list] = {}
 
+        # Trigger and proposal for each semantic sub (keyed by id())
+        semantic_results: dict[int, tuple[Trigger | None, Proposal | None]] = {}
+        # Fetch the files semantic subs live in with one git call
+        if target_ref and semantic_subs_by_file:
+            self._prefetch_sources(target_ref, list({
+                path_info[path][0]: None
+                for path, _language in semantic_subs_by_file
+                if not path_info[path][1]
+            }))
+        for (path, _language), subs in semantic_subs_by_file.items():
+            new_path, is_deleted = path_info[path]
+            for sub in subs:
+                semantic_results[id(sub)] = self._check_semantic(
+                    sub, base_ref, target_ref, new_path, is_deleted, status_map,
+                    file_diffs, construct_cache
+                )
+
+        # Collect results in subscription order
         for sub in active_subs:
             # Check if semantic subscription
             if sub.semantic is not None:
-                trigger, proposal = self._check_semantic(
-                    sub, base_ref, target_ref, rename_map, status_map,
-                    file_diffs, construct_cache
-                )
+                trigger, proposal = semantic_results[id(sub)]
                 if trigger:
                     triggers.append(trigger)
                 if proposal:
@@ -95,32 +241,13 @@ class Detector:
                     unchanged.append(sub)
                 continue
 
-            # Line-based subscription
-            # Check if file was renamed
-            new_path = rename_map.get(sub.path, sub.path)
-            is_renamed = new_path != sub.path
-
-            # Check if file was deleted
-            file_status = status_map.get(sub.path, "")
-            is_deleted = file_status == "D"
-
-            # Get diff for this file
-            file_diff = diff_by_path.get(sub.path)
-
-            # Check for triggers
-            trigger = self._check_trigger(sub, file_diff, is_deleted)
-
-            if trigger:
-                triggers.append(trigger)
+            result = line_results[id(sub)]
+            if isinstance(result, Trigger):
+                triggers.append(result)
+            elif result is not None:
+                proposals.append(result)
             else:
-                # Check for proposals (shift or rename)
-                proposal = self._compute_proposal(
-                    sub, file_diff, is_renamed, new_path
-                )
-                if proposal:
-                    proposals.append(proposal)
-                else:
-                    unchanged.append(sub)
+                unchanged.append(sub)
 
         return ScanResult(
             base_ref=base_ref,
@@ -130,15 +257,71 @@ class Detector:
             unchanged=unchanged,
         )
 
+    def _parse_diff(
+        self, patch_text: str
+    ) -> tuple[list[FileDiff], dict[str, str], dict[str, str]]:
+        """Parse a patch into file diffs, rename map and status map.
+
+        The result for the previous patch is kept, so repeated scans of an
+        unchanged diff skip parsing. It is keyed on the patch text itself,
+        which stays correct for symbolic refs and the working directory.
+        """
+        parsed = self._parsed_diff
+        if parsed is not None and (parsed[0] is patch_text or parsed[0] == patch_text):
+            return parsed[1], parsed[2], parsed[3]
+        file_diffs = self.parser.parse_patch(patch_text)
+        rename_map, status_map = self.parser.status_from_diffs(file_diffs)
+        self._parsed_diff = (patch_text, file_diffs, rename_map, status_map)
+        return file_diffs, rename_map, status_map
+
+    def _read_source(self, ref: str | None, path: str) -> str | None:
+        """Read a file at ref (None for the working directory).
+
+        Reads are memoized for the duration of a scan, including failures.
+
+        Returns:
+            File content, or None if the file is missing or unreadable.
+        """
+        key = (ref or "", path)
+        if key in self._source_cache:
+            return self._source_cache[key]
+        source: str | None
+        try:
+            if ref:
+                source = self.repo.show_file_text(ref, path)
+            else:
+                with open(os.path.join(self._root_dir, path), encoding="utf-8") as f:
+                    source = f.read()
+        except (FileNotFoundAtRefError, UnicodeDecodeError, OSError):
+            source = None
+        self._source_cache[key] = source
+        return source
+
+    def _prefetch_sources(self, ref: str, paths: list[str]) -> None:
+        """Load files at ref into the scan's source cache in one git call."""
+        missing = [path for path in paths if (ref, path) not in self._source_cache]
+        if not missing:
+            return
+        found = self.repo.show_files(ref, missing)
+        for path in missing:
+            self._source_cache[(ref, path)] = found.get(path)
+
     def _check_trigger(
         self,
         sub: Subscription,
         file_diff: FileDiff | None,
         is_deleted: bool,
+        index: _HunkIndex | None = None,
     ) -> Trigger | None:
         """
         Check if a subscription is triggered by changes.
 
+        Args:
+            sub: The subscription.
+            file_diff: Diff of the subscribed file, if it changed.
+            is_deleted: Whether the file was deleted.
+            index: Precomputed hunk index for file_diff (built if omitted).
+
         Returns:
             Trigger if triggered, None otherwise.
         """
@@ -167,18 +350,31 @@ class Detector:
                 matching_hunks=[],
             )
 
+        if index is None:
+            index = _HunkIndex(file_diff.hunks)
+
         matching_hunks: list[Hunk] = []
+        # Each reason is recorded once, in the order first seen
         reasons: list[str] = []
-
-        for hunk in file_diff.hunks:
+        seen_overlap = seen_insert = False
+
+        # Only hunks starting at or before end_line can match. Hunks of one
+        # diff never overlap on the old side, so of those starting before
+        # start_line only the last one can reach into the range.
+        starts, ends = index.starts, index.ends
+        lo = max(bisect_left(starts, sub.start_line) - 1, 0)
+        hi = bisect_right(starts, sub.end_line)
+
+        for i in range(lo, hi):
+            hunk = index.hunks[i]
+            hunk_start = starts[i]
+            hunk_end = ends[i]
             if hunk.old_count > 0:
                 # Modification or deletion: check for overlap
-                hunk_start = hunk.old_start
-                hunk_end = hunk.old_start + hunk.old_count - 1
-
                 if ranges_overlap(sub.start_line, sub.end_line, hunk_start, hunk_end):
                     matching_hunks.append(hunk)
-                    if "overlap_hunk" not in reasons:
+                    if not seen_overlap:
+                        seen_overlap = True
                         reasons.append("overlap_hunk")
             else:
                 # Pure insertion (old_count == 0)
@@ -196,7 +392,8 @@ class Detector:
                 # but NOT when insertion is immediately after the last line.
                 if sub.start_line <= hunk.old_start < sub.end_line:
                     matching_hunks.append(hunk)
-                    if "insert_inside_range" not in reasons:
+                    if not seen_insert:
+                        seen_insert = True
                         reasons.append("insert_inside_range")
 
         if reasons:
@@ -215,7 +412,7 @@ class Detector:
     def _compute_proposal(
         self,
         sub: Subscription,
-        file_diff: FileDiff | None,
+        index: _HunkIndex | None,
         is_renamed: bool,
         new_path: str,
     ) -> Proposal | None:
@@ -224,13 +421,19 @@ class Detector:
 
         Only called for non-triggered subscriptions.
 
+        Args:
+            sub: The subscription.
+            index: Hunk index of the subscribed file, if it changed.
+            is_renamed: Whether the file was renamed.
+            new_path: Path of the file at the target ref.
+
         Returns:
             Proposal if updates needed, None otherwise.
         """
         shift = 0
 
-        if file_diff is not None and file_diff.hunks:
-            shift = self._calculate_shift(sub, file_diff.hunks)
+        if index is not None and index.hunks:
+            shift = self._calculate_shift(sub, index)
 
         # Create proposal if there's a shift or rename
         if shift != 0 or is_renamed:
@@ -256,49 +459,30 @@ class Detector:
 
         return None
 
-    def _calculate_shift(self, sub: Subscription, hunks: list[Hunk]) -> int:
+    def _calculate_shift(self, sub: Subscription, index: _HunkIndex) -> int:
         """
         Calculate line number shift for a subscription.
 
         IMPORTANT: This should only be called for non-triggered subscriptions,
         meaning no hunk overlaps with the subscription range.
 
+        Under that precondition the shifting hunks are exactly those with
+        old_start < sub.start_line:
+        - Pure insertions (old_start is the line AFTER which lines are
+          inserted) shift the range iff old_start < start_line.
+        - A modification/deletion starting before start_line must also end
+          before it, or it would overlap the range.
+        Since hunks are sorted, that is a prefix, and the shift is its
+        precomputed net delta.
+
         Args:
             sub: The subscription.
-            hunks: List of hunks from the file diff (will be sorted if needed).
+            index: Hunk index of the file diff (hunks in ascending old_start).
 
         Returns:
             Net shift in line numbers.
         """
-        # Defensive sort - ensure hunks are in ascending old_start order
-        sorted_hunks = sorted(hunks, key=lambda h: h.old_start)
-
-        shift = 0
-        sub_start = sub.start_line
-
-        for hunk in sorted_hunks:
-            delta = hunk.new_count - hunk.old_count
-
-            if hunk.old_count == 0:
-                # Pure insertion: affects lines > old_start
-                # old_start is the line AFTER which insertion happens
-                if hunk.old_start < sub_start:
-                    shift += delta
-            else:
-                # Modification/deletion: old_end = old_start + old_count - 1
-                old_end = hunk.old_start + hunk.old_count - 1
-
-                if old_end < sub_start:
-                    # Hunk is entirely before subscription
-                    shift += delta
-                elif hunk.old_start > sub.end_line:
-                    # Hunk is entirely after subscription, stop processing
-                    # (hunks are sorted)
-                    break
-                # else: hunk overlaps subscription, but we shouldn't reach here
-                # because overlapping hunks would have triggered the subscription
-
-        return shift
+        return index.cum_delta[bisect_left(index.starts, sub.start_line)]
 
     def _search_cross_file(
         self,
@@ -309,6 +493,7 @@ class Detector:
         file_diffs: list[FileDiff],
         status_map: dict[str, str],
         construct_cache: dict[tuple[str, str], list],
+        max_matches: int | None = None,
     ) -> tuple[list[tuple[str, "Construct"]], str]:
         """Search for construct in other files from the diff.
 
@@ -320,21 +505,21 @@ class Detector:
             file_diffs: List of file diffs to search.
             status_map: Path to status mapping.
             construct_cache: Cache of indexed constructs per file.
+            max_matches: Stop searching further files once this many
+                matches are found (None searches every file).
 
         Returns:
             Tuple of (matches, best_match_tier).
             matches is list of (file_path, Construct) tuples.
             best_match_tier is "exact" | "body" | "interface" | "none".
         """
-        from .errors import UnsupportedLanguageError
-        from .semantic import detect_language, get_indexer
-
         target_language = semantic.language
         all_matches: list[tuple[str, "Construct"]] = []
         best_tier = "none"
         tier_priority = {"exact": 0, "body": 1, "interface": 2, "none": 3}
         skip_paths = {old_path, new_path}
 
+        candidates: list[str] = []
         for fd in file_diffs:
             candidate_path = fd.new_path
 
@@ -347,39 +532,44 @@ class Detector:
                 continue
 
             # Check language compatibility
-            try:
-                candidate_language = detect_language(candidate_path)
-                if candidate_language != target_language:
-                    continue
-            except UnsupportedLanguageError:
+            if language_for_path(candidate_path) != target_language:
                 continue
 
+            candidates.append(candidate_path)
+
+        # Fetch every candidate not indexed yet in one git call
+        if target_ref:
+            self._prefetch_sources(target_ref, [
+                path for path in candidates
+                if (path, target_language) not in construct_cache
+            ])
+
+        for candidate_path in candidates:
             # Check cache first
             cache_key = (candidate_path, target_language)
             if cache_key in construct_cache:
                 constructs = construct_cache[cache_key]
             else:
                 # Get file content
-                try:
-                    if target_ref:
-                        source = "\n".join(self.repo.show_file(target_ref, candidate_path))
-                    else:
-                        with open(self.repo.root / candidate_path, encoding="utf-8") as f:
-                            source = f.read()
-                except (FileNotFoundError, PermissionError, UnicodeDecodeError, OSError):
+                source = self._read_source(target_ref, candidate_path)
+                if source is None:
                     continue
 
                 # Index the file and cache
                 indexer = get_indexer(target_language)
-                constructs = indexer.index_file(source, candidate_path)
+                constructs = get_or_index(source, candidate_path, target_language, indexer)
                 construct_cache[cache_key] = constructs
 
             # Find matches using candidates API
-            matches, tier = self._find_hash_candidates(semantic, constructs)
+            matches, tier = self._find_hash_candidates(
+                semantic, constructs, self._construct_index(cache_key, constructs)
+            )
             for match in matches:
                 all_matches.append((candidate_path, match))
                 if tier_priority[tier] < tier_priority[best_tier]:
                     best_tier = tier
+            if max_matches is not None and len(all_matches) >= max_matches:
+                break
 
         return all_matches, best_tier
 
@@ -388,7 +578,8 @@ class Detector:
         sub: Subscription,
         base_ref: str,
         target_ref: str | None,
-        rename_map: dict[str, str],
+        new_path: str,
+        file_deleted: bool,
         status_map: dict[str, str],
         file_diffs: list[FileDiff],
         construct_cache: dict[tuple[str, str], list],
@@ -400,9 +591,6 @@ class Detector:
         - Stage 2: Hash-based search in same/renamed file
         - Stage 3: Cross-file hash search in other files from the diff
         """
-        from .errors import UnsupportedLanguageError
-        from .semantic import get_indexer
-
         assert sub.semantic is not None  # Type narrowing
 
         try:
@@ -425,44 +613,41 @@ class Detector:
             )
 
         old_path = sub.path
-        new_path = rename_map.get(old_path, old_path)
 
         # Track why we might fail, for final error message
-        file_deleted = status_map.get(old_path) == "D"
         file_read_failed = False
         new_source: str | None = None
 
         # Try to get new file content (may fail if deleted or unreadable)
         if not file_deleted:
-            try:
-                if target_ref:
-                    new_source = "\n".join(self.repo.show_file(target_ref, new_path))
-                else:
-                    with open(self.repo.root / new_path, encoding="utf-8") as f:
-                        new_source = f.read()
-            except (FileNotFoundError, PermissionError, UnicodeDecodeError, OSError):
-                file_read_failed = True
+            new_source = self._read_source(target_ref, new_path)
+            file_read_failed = new_source is None
 
         # Stage 1 & 2: Only if we have new_source
         if new_source is not None:
+            # Index the file once; every subscription on it shares the result
+            cache_key = (new_path, sub.semantic.language)
+            if cache_key in construct_cache:
+                constructs = construct_cache[cache_key]
+            else:
+                constructs = get_or_index(
+                    new_source, new_path, sub.semantic.language, indexer
+                )
+                construct_cache[cache_key] = constructs
+
             # Stage 1: Exact match by qualname
-            new_construct = indexer.find_construct(
-                new_source, new_path, sub.semantic.qualname, sub.semantic.kind
+            new_construct = self._find_by_qualname(
+                sub.semantic, self._construct_index(cache_key, constructs)
             )
 
             if new_construct:
                 # Found by exact qualname - check for changes
 
-                # Cache the constructs list for reuse
-                cache_key = (new_path, sub.semantic.language)
-                if cache_key not in construct_cache:
-                    construct_cache[cache_key] = indexer.index_file(new_source, new_path)
-                constructs = construct_cache[cache_key]
-
                 # For container subscriptions, delegate to container member check
                 if sub.semantic.include_members:
                     trigger = self._check_container_members(
-                        sub, new_source, new_path, indexer, new_construct, constructs
+                        sub, new_source, new_path, indexer, new_construct, constructs,
+                        self._construct_index(cache_key, constructs)
                     )
                 else:
                     trigger = self._classify_semantic_change(sub, new_construct)
@@ -519,20 +704,16 @@ class Detector:
                 return trigger, proposal
 
             # Stage 2: Hash-based search in same file
-            cache_key = (new_path, sub.semantic.language)
-            if cache_key in construct_cache:
-                new_constructs = construct_cache[cache_key]
-            else:
-                new_constructs = indexer.index_file(new_source, new_path)
-                construct_cache[cache_key] = new_constructs
-
-            match = self._find_by_hash(sub.semantic, new_constructs)
+            match = self._find_by_hash(
+                sub.semantic, constructs, self._construct_index(cache_key, constructs)
+            )
 
             if match:
                 # For container subscriptions, use container member check
                 if sub.semantic.include_members:
                     trigger = self._check_container_members(
-                        sub, new_source, new_path, indexer, match, new_constructs
+                        sub, new_source, new_path, indexer, match, constructs,
+                        self._construct_index(cache_key, constructs)
                     )
                 else:
                     trigger = self._classify_semantic_change(sub, match)
@@ -570,10 +751,13 @@ class Detector:
                 )
                 return trigger, proposal
 
-        # Stage 3: Cross-file search (always attempted, even if file deleted)
+        # Stage 3: Cross-file search (always attempted, even if file deleted).
+        # Unless duplicates are reported with their locations, two matches
+        # already decide the outcome.
         cross_matches, match_tier = self._search_cross_file(
             sub.semantic, old_path, new_path, target_ref, file_diffs,
-            status_map, construct_cache
+            status_map, construct_cache,
+            max_matches=None if sub.trigger_on_duplicate else 2,
         )
 
         if len(cross_matches) == 1:
@@ -581,31 +765,22 @@ class Detector:
             found_path, found_construct = cross_matches[0]
 
             # Get or cache the source and constructs for this file
+            # (cross-file search has already read it)
+            found_source = self._read_source(target_ref, found_path) or ""
             cache_key = (found_path, sub.semantic.language)
             if cache_key in construct_cache:
                 found_constructs = construct_cache[cache_key]
-                # Need source for inheritance check - try to read it
-                try:
-                    if target_ref:
-                        found_source = "\n".join(self.repo.show_file(target_ref, found_path))
-                    else:
-                        with open(self.repo.root / found_path, encoding="utf-8") as f:
-                            found_source = f.read()
-                except (FileNotFoundError, PermissionError, UnicodeDecodeError, OSError):
-                    found_source = ""
             else:
-                if target_ref:
-                    found_source = "\n".join(self.repo.show_file(target_ref, found_path))
-                else:
-                    with open(self.repo.root / found_path, encoding="utf-8") as f:
-                        found_source = f.read()
-                found_constructs = indexer.index_file(found_source, found_path)
+                found_constructs = get_or_index(
+                    found_source, found_path, sub.semantic.language, indexer
+                )
                 construct_cache[cache_key] = found_constructs
 
             # For container subscriptions, delegate to container member check
             if sub.semantic.include_members:
                 trigger = self._check_container_members(
-                    sub, found_source, found_path, indexer, found_construct, found_constructs
+                    sub, found_source, found_path, indexer, found_construct, found_constructs,
+                    self._construct_index(cache_key, found_constructs)
                 )
             else:
                 trigger = self._classify_semantic_change(sub, found_construct)
@@ -697,6 +872,7 @@ class Detector:
         indexer: "SemanticIndexer",
         current_container: "Construct",
         constructs: "list[Construct]",
+        index: _ConstructIndex | None = None,
     ) -> Trigger | None:
         """Check container subscription for member changes.
 
@@ -707,6 +883,7 @@ class Detector:
             indexer: The language indexer.
             current_container: The matched container construct (may have different qualname if renamed).
             constructs: Pre-indexed constructs from the file.
+            index: Prebuilt lookup tables for constructs, if available.
 
         Returns a trigger if any member changed, was added, or was removed.
         """
@@ -717,17 +894,20 @@ class Detector:
         baseline_container_qualname = semantic.baseline_container_qualname or semantic.qualname
         current_container_qualname = current_container.qualname
 
-        # Get current members using the CURRENT container qualname
+        # Get current members using the CURRENT container qualname. The
+        # indexer applies its language's visibility rules; with an index it
+        # only has to look at the container's direct members.
+        if index is not None:
+            constructs = index.by_container.get(current_container_qualname, [])
         current_members = indexer.get_container_members(
             new_source, new_path, current_container_qualname, semantic.include_private,
             constructs=constructs
         )
 
         # Build lookup by RELATIVE member ID (strip container prefix)
-        current_by_relative_id: dict[str, "Construct"] = {}
-        for m in current_members:
-            relative_id = m.qualname[len(current_container_qualname) + 1:]  # +1 for dot
-            current_by_relative_id[relative_id] = m
+        current_by_relative_id: dict[str, "Construct"] = {
+            m.qualname.rpartition(".")[2]: m for m in current_members
+        }
 
         # Get baseline members (already stored by relative ID)
         baseline_members = semantic.baseline_members or {}
@@ -881,40 +1061,44 @@ class Detector:
         # No meaningful change (cosmetic only)
         return None
 
+    def _construct_index(
+        self, cache_key: tuple[str, str], constructs: "list[Construct]"
+    ) -> _ConstructIndex:
+        """Get the lookup tables for a construct_cache entry, building them once."""
+        index = self._construct_indexes.get(cache_key)
+        if index is None:
+            index = self._construct_indexes[cache_key] = _ConstructIndex(constructs)
+        return index
+
+    def _find_by_qualname(
+        self,
+        semantic: SemanticTarget,
+        index: _ConstructIndex,
+    ) -> "Construct | None":
+        """Find construct by qualname and kind, like indexer.find_construct."""
+        matches = index.by_qualname.get((semantic.qualname, semantic.kind), ())
+        return matches[0] if len(matches) == 1 else None
+
     def _find_by_hash(
         self,
         semantic: SemanticTarget,
         constructs: "list[Construct]",
+        index: _ConstructIndex | None = None,
     ) -> "Construct | None":
         """Find construct by hash matching."""
+        exact, body, interface = (index or _ConstructIndex(constructs)).hash_matches(semantic)
+
         # Try exact match (both hashes)
-        matches = [
-            c
-            for c in constructs
-            if c.interface_hash == semantic.interface_hash
-            and c.body_hash == semantic.body_hash
-            and c.kind == semantic.kind
-        ]
-        if len(matches) == 1:
-            return matches[0]
+        if len(exact) == 1:
+            return exact[0]
 
         # Try body-only match (renamed + signature changed)
-        matches = [
-            c
-            for c in constructs
-            if c.body_hash == semantic.body_hash and c.kind == semantic.kind
-        ]
-        if len(matches) == 1:
-            return matches[0]
+        if len(body) == 1:
+            return body[0]
 
         # Try interface-only match (renamed + body changed)
-        matches = [
-            c
-            for c in constructs
-            if c.interface_hash == semantic.interface_hash and c.kind == semantic.kind
-        ]
-        if len(matches) == 1:
-            return matches[0]
+        if len(interface) == 1:
+            return interface[0]
 
         return None
 
@@ -922,6 +1106,7 @@ class Detector:
         self,
         semantic: SemanticTarget,
         constructs: "list[Construct]",
+        index: _ConstructIndex | None = None,
     ) -> tuple[list["Construct"], str]:
         """Find all constructs matching by hash, with match tier.
 
@@ -932,39 +1117,25 @@ class Detector:
         Args:
             semantic: The semantic target with fingerprints.
             constructs: List of constructs to search.
+            index: Prebuilt lookup tables for constructs, if available.
 
         Returns:
             Tuple of (matching_constructs, match_tier).
             match_tier is "exact" | "body" | "interface" | "none".
         """
+        exact, body, interface = (index or _ConstructIndex(constructs)).hash_matches(semantic)
+
         # Try exact match (both hashes)
-        exact_matches = [
-            c
-            for c in constructs
-            if c.interface_hash == semantic.interface_hash
-            and c.body_hash == semantic.body_hash
-            and c.kind == semantic.kind
-        ]
-        if exact_matches:
-            return exact_matches, "exact"
+        if exact:
+            return exact, "exact"
 
         # Try body-only match (renamed + signature changed)
-        body_matches = [
-            c
-            for c in constructs
-            if c.body_hash == semantic.body_hash and c.kind == semantic.kind
-        ]
-        if body_matches:
-            return body_matches, "body"
+        if body:
+            return list(body), "body"
 
         # Try interface-only match (renamed + body changed)
-        interface_matches = [
-            c
-            for c in constructs
-            if c.interface_hash == semantic.interface_hash and c.kind == semantic.kind
-        ]
-        if interface_matches:
-            return interface_matches, "interface"
+        if interface:
+            return list(interface), "interface"
 
         return [], "none"
 
@@ -997,13 +1168,6 @@ class Detector:
         Returns:
             Trigger if inherited members changed, None otherwise.
         """
-        from .semantic import (
-            InheritanceResolver,
-            get_indexer,
-            get_member_id,
-            get_overridden_members,
-        )
-
         assert sub.semantic is not None
 
         # Only applies to class/interface/enum subscriptions
@@ -1023,7 +1187,7 @@ class Detector:
         if cache_key in construct_cache:
             constructs = construct_cache[cache_key]
         else:
-            constructs = indexer.index_file(new_source, new_path)
+            constructs = get_or_index(new_source, new_path, sub.semantic.language, indexer)
             construct_cache[cache_key] = constructs
 
         resolver.add_file(new_path, constructs, new_source)
@@ -1037,7 +1201,10 @@ class Detector:
         # Get child's member IDs (to check for overrides)
         child_members = indexer.get_container_members(
             new_source, new_path, current_construct.qualname,
-            include_private=True, constructs=constructs
+            include_private=True,
+            constructs=self._construct_index(cache_key, constructs).by_container.get(
+                current_construct.qualname, []
+            ),
         )
         child_member_ids = get_overridden_members(
             child_members, current_construct.qualname, sub.semantic.language
@@ -1078,29 +1245,29 @@ class Detector:
 
             # Update overridden_in_chain with this parent's members
             # (for checking grandparent changes)
-            try:
-                if target_ref:
-                    parent_source = "\n".join(self.repo.show_file(target_ref, parent_path))
-                else:
-                    parent_source = (self.repo.root / parent_path).read_text(encoding="utf-8")
-
-                parent_cache_key = (parent_path, sub.semantic.language)
-                if parent_cache_key in construct_cache:
-                    parent_constructs = construct_cache[parent_cache_key]
-                else:
-                    parent_constructs = indexer.index_file(parent_source, parent_path)
-                    construct_cache[parent_cache_key] = parent_constructs
-
-                parent_members = indexer.get_container_members(
-                    parent_source, parent_path, parent_qualname,
-                    include_private=True, constructs=parent_constructs
-                )
-                parent_member_ids = get_overridden_members(
-                    parent_members, parent_qualname, sub.semantic.language
+            parent_source = self._read_source(target_ref, parent_path)
+            if parent_source is None:
+                continue  # Parent file not readable
+            parent_cache_key = (parent_path, sub.semantic.language)
+            if parent_cache_key in construct_cache:
+                parent_constructs = construct_cache[parent_cache_key]
+            else:
+                parent_constructs = get_or_index(
+                    parent_source, parent_path, sub.semantic.language, indexer
                 )
-                overridden_in_chain.update(parent_member_ids)
-            except (FileNotFoundError, OSError, UnicodeDecodeError):
-                pass  # Parent file not readable, continue
+                construct_cache[parent_cache_key] = parent_constructs
+
+            parent_members = indexer.get_container_members(
+                parent_source, parent_path, parent_qualname,
+                include_private=True,
+                constructs=self._construct_index(
+                    parent_cache_key, parent_constructs
+                ).by_container.get(parent_qualname, []),
+            )
+            parent_member_ids = get_overridden_members(
+                parent_members, parent_qualname, sub.semantic.language
+            )
+            overridden_in_chain.update(parent_member_ids)
 
         if not inherited_changes:
             return None
@@ -1157,9 +1324,6 @@ class Detector:
         Returns:
             List of change dicts with member_name, change_type, etc.
         """
-        from .errors import UnsupportedLanguageError
-        from .semantic import get_indexer
-
         changes: list[dict[str, Any]] = []
 
         try:
@@ -1169,18 +1333,19 @@ class Detector:
 
         # Get parent at base_ref
         try:
-            base_source = "\n".join(self.repo.show_file(base_ref, parent_path))
-            base_constructs = indexer.index_file(base_source, parent_path)
+            base_source = self._read_source(base_ref, parent_path)
+            if base_source is None:
+                return changes
+            base_constructs = get_or_index(base_source, parent_path, language, indexer)
         except Exception:
             return changes  # Parent didn't exist at base_ref
 
         # Get parent at target_ref
         try:
-            if target_ref:
-                target_source = "\n".join(self.repo.show_file(target_ref, parent_path))
-            else:
-                target_source = (self.repo.root / parent_path).read_text(encoding="utf-8")
-            target_constructs = indexer.index_file(target_source, parent_path)
+            target_source = self._read_source(target_ref, parent_path)
+            if target_source is None:
+                raise FileNotFoundError(parent_path)
+            target_constructs = get_or_index(target_source, parent_path, language, indexer)
         except Exception:
             # Parent deleted or unreadable at target
             changes.append({
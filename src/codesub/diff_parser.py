@@ -1,6 +1,7 @@
 """Git diff parsing for codesub."""
 
 import re
+import sys
 from dataclasses import dataclass, field
 
 from .models import FileDiff, Hunk
@@ -26,7 +27,8 @@ class DiffParser:
             diff_text: Output from `git diff -U0 --find-renames base target`.
 
         Returns:
-            List of FileDiff objects, one per changed file.
+            List of FileDiff objects, one per changed file. Each file's
+            hunks are in ascending old_start order.
         """
         if not diff_text.strip():
             return []
@@ -48,8 +50,8 @@ class DiffParser:
                     current_diff.hunks.sort(key=lambda h: h.old_start)
                     file_diffs.append(current_diff)
 
-                old_path = header_match.group(1)
-                new_path = header_match.group(2)
+                old_path = sys.intern(header_match.group(1))
+                new_path = sys.intern(header_match.group(2))
                 current_diff = FileDiff(
                     old_path=old_path,
                     new_path=new_path,
@@ -72,14 +74,14 @@ class DiffParser:
 
                 rename_from = RENAME_FROM_PATTERN.match(line)
                 if rename_from:
-                    current_diff.old_path = rename_from.group(1)
+                    current_diff.old_path = sys.intern(rename_from.group(1))
                     current_diff.is_rename = True
                     i += 1
                     continue
 
                 rename_to = RENAME_TO_PATTERN.match(line)
                 if rename_to:
-                    current_diff.new_path = rename_to.group(1)
+                    current_diff.new_path = sys.intern(rename_to.group(1))
                     current_diff.is_rename = True
                     i += 1
                     continue
@@ -113,6 +115,39 @@ class DiffParser:
 
         return file_diffs
 
+    def status_from_diffs(
+        self, file_diffs: list[FileDiff]
+    ) -> tuple[dict[str, str], dict[str, str]]:
+        """
+        Derive rename and status maps from parsed patch headers.
+
+        parse_patch() input is produced with --find-renames, so its headers
+        carry the same rename/add/delete information as
+        `git diff --name-status -M`; this avoids running that second diff.
+
+        Args:
+            file_diffs: Output of parse_patch().
+
+        Returns:
+            Tuple of (rename_map, status_map) shaped like parse_name_status()
+            (renames are reported as plain "R", without a similarity score).
+        """
+        rename_map: dict[str, str] = {}
+        status_map: dict[str, str] = {}
+
+        for fd in file_diffs:
+            if fd.is_rename:
+                rename_map[fd.old_path] = fd.new_path
+                status_map[fd.old_path] = "R"
+            elif fd.is_deleted_file:
+                status_map[fd.old_path] = "D"
+            elif fd.is_new_file:
+                status_map[fd.new_path] = "A"
+            else:
+                status_map[fd.old_path] = "M"
+
+        return rename_map, status_map
+
     def parse_name_status(self, name_status_text: str) -> tuple[dict[str, str], dict[str, str]]:
         """
         Parse git diff --name-status output.
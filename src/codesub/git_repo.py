@@ -1,11 +1,29 @@
 """Git repository wrapper for codesub."""
 
+import re
 import subprocess
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
 from .errors import FileNotFoundAtRefError, GitError, NotAGitRepoError
 from .utils import normalize_path
 
+# Full object names (SHA-1 or SHA-256); what they point to never changes
+_OBJECT_NAME_RE = re.compile(r"[0-9a-f]{40}|[0-9a-f]{64}")
+
+# Diff output between two full object names, shared by all GitRepo
+# instances: (repo root, diff kind, base, target) -> output
+DIFF_CACHE_SIZE = 16
+_diff_cache: OrderedDict[tuple[str, str, str, str], str] = OrderedDict()
+_diff_cache_lock = threading.Lock()
+
+# Full object names rev-parse has accepted, shared by all GitRepo instances
+# so a ref resolved by one command or API request is reused by the next:
+# {(repo root, object name)}. Cleared once it reaches REF_CACHE_SIZE.
+REF_CACHE_SIZE = 1024
+_resolved_objects: set[tuple[str, str]] = set()
+
 
 class GitRepo:
     """Wrapper for git operations."""
@@ -79,6 +97,13 @@ class GitRepo:
         Raises:
             GitError: If ref cannot be resolved.
         """
+        # Only full object names are cached: symbolic refs like HEAD move as
+        # the repository changes
+        key = None
+        if _OBJECT_NAME_RE.fullmatch(ref):
+            key = (str(self.root), ref)
+            if key in _resolved_objects:
+                return ref
         result = subprocess.run(
             ["git", "rev-parse", ref],
             cwd=self.root,
@@ -87,7 +112,12 @@ class GitRepo:
         )
         if result.returncode != 0:
             raise GitError(f"git rev-parse {ref}", result.stderr.strip())
-        return result.stdout.strip()
+        resolved = result.stdout.strip()
+        if key is not None and resolved == ref:
+            if len(_resolved_objects) >= REF_CACHE_SIZE:
+                _resolved_objects.clear()
+            _resolved_objects.add(key)
+        return resolved
 
     def show_file(self, ref: str, path: str) -> list[str]:
         """
@@ -100,6 +130,29 @@ class GitRepo:
         Returns:
             List of lines (without trailing newlines).
 
+        Raises:
+            FileNotFoundAtRefError: If file doesn't exist at ref.
+            GitError: If git command fails for other reasons.
+        """
+        content = self.show_file_text(ref, path)
+        if not content:
+            return []
+        return content.split("\n")
+
+    def show_file_text(self, ref: str, path: str) -> str:
+        """
+        Get file content at a specific ref as a single string.
+
+        Equivalent to "\n".join(show_file(ref, path)), without building the
+        list of lines.
+
+        Args:
+            ref: Git ref (commit hash, branch name, etc.).
+            path: Repo-relative path to the file.
+
+        Returns:
+            File content without its trailing newline.
+
         Raises:
             FileNotFoundAtRefError: If file doesn't exist at ref.
             GitError: If git command fails for other reasons.
@@ -117,13 +170,79 @@ class GitRepo:
                 raise FileNotFoundAtRefError(path, ref)
             raise GitError(f"git show {ref}:{path}", stderr)
 
-        # Split into lines, preserving empty lines but removing trailing newline
+        # Remove the trailing newline, preserving empty lines before it
         content = result.stdout
         if content.endswith("\n"):
             content = content[:-1]
-        if not content:
-            return []
-        return content.split("\n")
+        return content
+
+    def show_files(self, ref: str, paths: list[str]) -> dict[str, str]:
+        """
+        Get the content of several files at a ref with a single git call.
+
+        Args:
+            ref: Git ref (commit hash, branch name, etc.).
+            paths: Repo-relative paths to the files.
+
+        Returns:
+            Dict mapping each path to its content, as show_file_text returns it.
+            Paths that don't exist at ref or aren't UTF-8 text are omitted.
+
+        Raises:
+            GitError: If git command fails.
+        """
+        contents: dict[str, str] = {}
+        # cat-file reads one object name per line; fetch the rare path that
+        # contains a newline on its own
+        batch: list[str] = []
+        for path in paths:
+            if "\n" in path:
+                try:
+                    contents[path] = self.show_file_text(ref, path)
+                except (FileNotFoundAtRefError, UnicodeDecodeError):
+                    pass
+            else:
+                batch.append(path)
+        if not batch:
+            return contents
+
+        request = "".join(f"{ref}:{normalize_path(path)}\n" for path in batch)
+        result = subprocess.run(
+            ["git", "cat-file", "--batch=%(objecttype) %(objectsize)"],
+            cwd=self.root,
+            input=request.encode("utf-8"),
+            capture_output=True,
+        )
+        if result.returncode != 0:
+            raise GitError("git cat-file --batch", result.stderr.decode(errors="replace").strip())
+
+        # Each object is "<type> <size>\n<content>\n", or a single line
+        # like "<object> missing\n" when it can't be read. The requested
+        # object name may contain spaces, so only the type/size form is
+        # recognized as a header.
+        out = result.stdout
+        pos = 0
+        for path in batch:
+            eol = out.index(b"\n", pos)
+            objtype, _, size_field = out[pos:eol].partition(b" ")
+            pos = eol + 1
+            if not size_field.isdigit():
+                continue
+            size = int(size_field)
+            data = out[pos:pos + size]
+            pos += size + 1
+            if objtype != b"blob":
+                continue
+            try:
+                content = data.decode("utf-8")
+            except UnicodeDecodeError:
+                continue
+            # Match show_file_text, which reads git output in text mode
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+            if content.endswith("\n"):
+                content = content[:-1]
+            contents[path] = content
+        return contents
 
     def list_files(self, ref: str) -> list[str]:
         """
@@ -169,15 +288,7 @@ class GitRepo:
         else:
             # Compare base to working directory (uncommitted changes)
             cmd = ["git", "diff", "-U0", "--find-renames", base]
-        result = subprocess.run(
-            cmd,
-            cwd=self.root,
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode != 0:
-            raise GitError(f"git diff {base} {target or '(working)'}", result.stderr.strip())
-        return result.stdout
+        return self._run_diff("patch", cmd, base, target, f"git diff {base} {target or '(working)'}")
 
     def diff_name_status(self, base: str, target: str | None = None) -> str:
         """
@@ -194,6 +305,29 @@ class GitRepo:
             cmd = ["git", "diff", "--name-status", "-M", "--find-renames", base, target]
         else:
             cmd = ["git", "diff", "--name-status", "-M", "--find-renames", base]
+        return self._run_diff(
+            "name-status", cmd, base, target,
+            f"git diff --name-status {base} {target or '(working)'}",
+        )
+
+    def _run_diff(
+        self, kind: str, cmd: list[str], base: str, target: str | None, description: str
+    ) -> str:
+        """
+        Run a git diff command, reusing earlier output when it can't change.
+
+        Only diffs between two full object names are cached; symbolic refs
+        and the working directory may change between calls.
+        """
+        key = None
+        if target and _OBJECT_NAME_RE.fullmatch(base) and _OBJECT_NAME_RE.fullmatch(target):
+            key = (str(self.root), kind, base, target)
+            with _diff_cache_lock:
+                cached = _diff_cache.get(key)
+                if cached is not None:
+                    _diff_cache.move_to_end(key)
+                    return cached
+
         result = subprocess.run(
             cmd,
             cwd=self.root,
@@ -201,7 +335,13 @@ class GitRepo:
             text=True,
         )
         if result.returncode != 0:
-            raise GitError(f"git diff --name-status {base} {target or '(working)'}", result.stderr.strip())
+            raise GitError(description, result.stderr.strip())
+
+        if key is not None:
+            with _diff_cache_lock:
+                _diff_cache[key] = result.stdout
+                while len(_diff_cache) > DIFF_CACHE_SIZE:
+                    _diff_cache.popitem(last=False)
         return result.stdout
 
     def file_line_count(self, ref: str, path: str) -> int:
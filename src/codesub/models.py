@@ -3,6 +3,7 @@
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
+import sys
 import uuid
 
 
@@ -23,7 +24,7 @@ CONTAINER_KINDS: dict[str, set[str]] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class MemberFingerprint:
     """Fingerprint data for a container member at baseline."""
 
@@ -125,17 +126,17 @@ class Anchor:
 
     def to_dict(self) -> dict[str, Any]:
         return {
-            "context_before": self.context_before,
-            "lines": self.lines,
-            "context_after": self.context_after,
+            "context_before": list(self.context_before),
+            "lines": list(self.lines),
+            "context_after": list(self.context_after),
         }
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Anchor":
         return cls(
-            context_before=data.get("context_before", []),
-            lines=data.get("lines", []),
-            context_after=data.get("context_after", []),
+            context_before=list(data.get("context_before", [])),
+            lines=list(data.get("lines", [])),
+            context_after=list(data.get("context_after", [])),
         )
 
 
@@ -186,8 +187,9 @@ class Subscription:
         if "semantic" in data:
             semantic = SemanticTarget.from_dict(data["semantic"])
         return cls(
-            id=data["id"],
-            path=data["path"],
+            # Interned: IDs and paths are used as dict keys throughout
+            id=sys.intern(data["id"]),
+            path=sys.intern(data["path"]),
             start_line=data["start_line"],
             end_line=data["end_line"],
             label=data.get("label"),
@@ -290,7 +292,7 @@ class Config:
 # Models for diff parsing
 
 
-@dataclass
+@dataclass(slots=True)
 class Hunk:
     """A single hunk from a unified diff."""
 
@@ -300,7 +302,7 @@ class Hunk:
     new_count: int
 
 
-@dataclass
+@dataclass(slots=True)
 class FileDiff:
     """Diff information for a single file."""
 
@@ -315,7 +317,7 @@ class FileDiff:
 # Models for detection results
 
 
-@dataclass
+@dataclass(slots=True)
 class Trigger:
     """A subscription that was triggered by changes."""
 
@@ -332,7 +334,7 @@ class Trigger:
     details: dict[str, Any] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Proposal:
     """A proposed update to a subscription (rename or line shift)."""
 
@@ -14,6 +14,7 @@ from .registry import (
     detect_language,
     get_indexer,
     get_indexer_for_path,
+    language_for_path,
     register_indexer,
     supported_languages,
 )
@@ -40,6 +41,7 @@ __all__ = [
     "detect_language",
     "get_indexer",
     "get_indexer_for_path",
+    "language_for_path",
     "supported_languages",
     "UnsupportedLanguageError",
     # Fingerprinting
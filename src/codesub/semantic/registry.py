@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable
 
@@ -33,6 +34,21 @@ def register_indexer(
         _extension_to_language[ext.lower()] = language
 
 
+def language_for_path(path: str) -> str | None:
+    """Look up the language of a file path by its extension.
+
+    Unlike detect_language, this doesn't raise, which makes it cheap for
+    filtering many paths.
+
+    Args:
+        path: File path to analyze.
+
+    Returns:
+        Language identifier, or None if the extension is not recognized.
+    """
+    return _extension_to_language.get(os.path.splitext(path)[1].lower())
+
+
 def detect_language(path: str) -> str:
     """Detect the programming language from a file path.
 
@@ -45,14 +61,15 @@ def detect_language(path: str) -> str:
     Raises:
         UnsupportedLanguageError: If the file extension is not recognized.
     """
-    ext = Path(path).suffix.lower()
-    if ext not in _extension_to_language:
+    language = language_for_path(path)
+    if language is None:
+        ext = Path(path).suffix.lower()
         raise UnsupportedLanguageError(
             language=ext or "<no extension>",
             supported=sorted(_language_factories.keys()),
             hint=f"File '{path}' has no registered indexer.",
         )
-    return _extension_to_language[ext]
+    return language
 
 
 def get_indexer(language: str) -> SemanticIndexer:
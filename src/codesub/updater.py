@@ -5,7 +5,7 @@ from typing import Any
 from .config_store import ConfigStore
 from .errors import SubscriptionNotFoundError
 from .git_repo import GitRepo
-from .models import Anchor, _utc_now
+from .models import Anchor, Subscription, _utc_now
 from .utils import extract_anchors
 
 
@@ -44,6 +44,7 @@ class Updater:
 
         applied: list[str] = []
         warnings: list[str] = []
+        updated: list[Subscription] = []
 
         config = self.store.load()
 
@@ -143,12 +144,13 @@ class Updater:
                             f"Failed to recapture baseline members for {sub_id[:8]}"
                         )
 
+                updated.append(sub)
+
             applied.append(sub_id)
 
-        # Save changes and update baseline
+        # Save changes and update baseline in a single write
         if not dry_run and applied:
-            self.store.save(config)
-            self.store.update_baseline(target_ref)
+            self.store.update_many(updated, baseline_ref=target_ref)
 
         return applied, warnings
 
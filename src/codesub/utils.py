@@ -1,11 +1,42 @@
 """Utility functions for codesub."""
 
+import json
 import re
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 from .errors import InvalidLocationError, InvalidLineRangeError
 
+# orjson is optional: it is much faster for large configs. Without it the
+# stdlib json module is used with ensure_ascii=False, so both write
+# non-ASCII text as raw UTF-8 and produce the same output.
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Parse JSON text (uses orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> str:
+    """Serialize obj as 2-space indented JSON text."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    """Serialize obj as 2-space indented UTF-8 JSON with a trailing newline, for files."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
 
 @dataclass(frozen=True)
 class LineTarget:
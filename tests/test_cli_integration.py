@@ -128,6 +128,30 @@ class TestCLIIntegration:
         assert len(data) == 1
         assert data[0]["label"] == "Test"
 
+    def test_list_json_non_ascii_stdout(self, git_repo, cli_data_dir):
+        """list --json escapes non-ASCII text when stdout can't encode it."""
+        import os
+
+        register_project(git_repo, cli_data_dir)
+        run_codesub(["add", "test.txt:2-3", "--label", "café"], git_repo, cli_data_dir)
+
+        env = os.environ.copy()
+        env["CODESUB_DATA_DIR"] = str(cli_data_dir)
+        env["PYTHONIOENCODING"] = "ascii"
+        result = subprocess.run(
+            [sys.executable, "-m", "codesub.cli", "list", "--json"],
+            cwd=git_repo,
+            capture_output=True,
+            env=env,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert b"caf\\u00e9" in result.stdout
+        assert json.loads(result.stdout)[0]["label"] == "café"
+
+        utf8 = run_codesub(["list", "--json"], git_repo, cli_data_dir)
+        assert json.loads(utf8.stdout)[0]["label"] == "café"
+
     def test_list_verbose(self, git_repo, cli_data_dir):
         """codesub list --verbose should show anchors."""
         register_project(git_repo, cli_data_dir)
@@ -359,3 +383,45 @@ class TestCLIIntegration:
         result = run_codesub(["scan"], git_repo, cli_data_dir)
         # Either shows "UNCHANGED" or "same ref" message (baseline == HEAD after apply)
         assert "UNCHANGED" in result.stdout or "same" in result.stdout
+
+
+class TestCLIFastPath:
+    """Tests for --version/--help handled before the parser is built."""
+
+    def test_version(self, temp_dir):
+        from codesub import __version__
+
+        result = run_codesub(["--version"], temp_dir)
+        assert result.returncode == 0
+        assert result.stdout.strip() == f"codesub {__version__}"
+
+    def test_static_help_matches_parser(self, monkeypatch):
+        from codesub.cli import _ROOT_HELP, create_parser
+
+        monkeypatch.setenv("COLUMNS", "80")
+        assert create_parser().format_help() == _ROOT_HELP
+
+    def test_parser_builds_only_sniffed_command(self):
+        from codesub.cli import create_parser
+
+        args = create_parser("list").parse_args(["list", "--json"])
+        assert args.command == "list"
+        assert args.json is True
+
+        # Unknown commands fall back to the full parser for accurate errors
+        with pytest.raises(SystemExit):
+            create_parser("bogus").parse_args(["bogus"])
+
+    def test_root_help_and_errors_list_every_command(self, temp_dir):
+        from codesub.cli import _COMMANDS
+
+        choices = "{" + ",".join(_COMMANDS) + "}"
+
+        result = run_codesub(["-h", "add"], temp_dir)
+        assert result.returncode == 0
+        assert choices in result.stdout
+
+        result = run_codesub(["list", "--bogus"], temp_dir)
+        assert result.returncode == 2
+        assert choices in result.stderr
+        assert "unrecognized arguments: --bogus" in result.stderr
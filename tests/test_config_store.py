@@ -1,12 +1,15 @@
 """Tests for ConfigStore."""
 
+import io
 import json
+import os
 
 import pytest
 
-from codesub.config_store import ConfigStore
+from codesub.config_store import STREAM_WRITE_THRESHOLD, ConfigStore, _write_streaming
 from codesub.errors import ConfigExistsError, ConfigNotFoundError, SubscriptionNotFoundError
-from codesub.models import Subscription
+from codesub.models import Anchor, Config, Subscription
+from codesub.utils import json_dumps_bytes
 
 
 class TestConfigStore:
@@ -147,3 +150,294 @@ class TestConfigStore:
         assert loaded_sub.label == sub.label
         assert loaded_sub.description == sub.description
         assert loaded_sub.anchors.lines == sub.anchors.lines
+
+    def test_load_cache_returns_independent_copies(self, temp_dir):
+        store = ConfigStore(temp_dir)
+        store.init("abc123")
+
+        first = store.load()
+        first.repo.baseline_ref = "mutated"
+        first.subscriptions.append(
+            Subscription.create(path="x.py", start_line=1, end_line=1)
+        )
+
+        second = store.load()
+        assert second is not first
+        assert second.repo.baseline_ref == "abc123"
+        assert second.subscriptions == []
+
+    def test_cached_reads_do_not_leak_mutations(self, temp_dir):
+        store = ConfigStore(temp_dir)
+        store.init("abc123")
+        sub = Subscription.create(
+            path="a.py", start_line=1, end_line=1,
+            anchors=Anchor(context_before=[], lines=["x = 1"], context_after=[]),
+        )
+        store.add_subscription(sub)
+        # Mutating the caller's object after save must not touch the cache
+        sub.anchors.lines.append("y = 2")
+
+        listed = store.list_subscriptions()
+        assert listed[0].anchors.lines == ["x = 1"]
+        # Read-only listings reuse the same objects while the file is unchanged
+        assert store.list_subscriptions()[0] is listed[0]
+
+        fetched = store.get_subscription(sub.id)
+        fetched.anchors.lines.append("z = 3")
+        assert store.load().subscriptions[0].anchors.lines == ["x = 1"]
+        assert store.get_baseline() == "abc123"
+
+    def test_load_reparses_when_file_changes(self, temp_dir):
+        store = ConfigStore(temp_dir)
+        store.init("abc123")
+
+        first = store.load()
+
+        # Simulate an external edit (e.g. another process) with a new mtime
+        data = json.loads(store.config_path.read_text())
+        data["repo"]["baseline_ref"] = "external"
+        store.config_path.write_text(json.dumps(data))
+        st = store.config_path.stat()
+        os.utime(store.config_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        reloaded = store.load()
+        assert reloaded is not first
+        assert reloaded.repo.baseline_ref == "external"
+
+    def test_saved_file_format_matches_stdlib_json(self, temp_dir):
+        store = ConfigStore(temp_dir)
+        store.init("abc123")
+        store.add_subscription(
+            Subscription.create(path="a.py", start_line=1, end_line=2, label="café ✓")
+        )
+
+        text = store.config_path.read_text(encoding="utf-8")
+        assert "café ✓" in text
+        assert text == json.dumps(json.loads(text), indent=2, ensure_ascii=False) + "\n"
+
+    def test_stdlib_fallback_matches_orjson(self, monkeypatch):
+        pytest.importorskip("orjson")
+        import codesub.utils as utils
+
+        data = {"label": "café ✓", "lines": ["a", ""], "n": [1, None, True]}
+        with_orjson = utils.json_dumps_bytes(data)
+        monkeypatch.setattr(utils, "orjson", None)
+        assert utils.json_dumps_bytes(data) == with_orjson
+        assert utils.json_dumps(data) + "\n" == with_orjson.decode("utf-8")
+
+    def test_prefix_lookup_ambiguous_and_exact(self, temp_dir):
+        store = ConfigStore(temp_dir)
+        store.init("abc123")
+
+        for sub_id in ["aaaa-1", "aaab-2", "bbbb-3"]:
+            sub = Subscription.create(path="a.py", start_line=1, end_line=1)
+            sub.id = sub_id
+            store.add_subscription(sub)
+
+        assert store.get_subscription("aaab").id == "aaab-2"
+        assert store.get_subscription("bbbb-3").id == "bbbb-3"
+        with pytest.raises(SubscriptionNotFoundError, match="ambiguous"):
+            store.get_subscription("aaa")
+        with pytest.raises(SubscriptionNotFoundError):
+            store.get_subscription("c")
+
+        removed = store.remove_subscription("aaaa", hard=True)
+        assert removed.id == "aaaa-1"
+        assert store.get_subscription("aaa").id == "aaab-2"
+
+    def test_exact_id_wins_over_longer_prefix_matches(self, temp_dir):
+        store = ConfigStore(temp_dir)
+        store.init("abc123")
+        for sub_id in ["bbbb", "bbbb-3"]:
+            sub = Subscription.create(path="a.py", start_line=1, end_line=1)
+            sub.id = sub_id
+            store.add_subscription(sub)
+
+        assert store.get_subscription("bbbb").id == "bbbb"
+        with pytest.raises(SubscriptionNotFoundError, match="ambiguous"):
+            store.get_subscription("bbb")
+
+    def test_update_many_single_save(self, temp_dir, monkeypatch):
+        """update_many writes all subscriptions and the baseline in one save."""
+        store = ConfigStore(temp_dir)
+        store.init("abc123")
+        a = Subscription.create(path="a.py", start_line=1, end_line=2)
+        b = Subscription.create(path="b.py", start_line=3, end_line=4)
+        store.add_subscription(a)
+        store.add_subscription(b)
+
+        saves = []
+        original_save = store.save
+        monkeypatch.setattr(
+            store, "save", lambda config: (saves.append(1), original_save(config))
+        )
+
+        a.start_line = 10
+        a.end_line = 11
+        b.label = "moved"
+        store.update_many([a, b], baseline_ref="def456")
+
+        assert len(saves) == 1
+        assert store.get_subscription(a.id).start_line == 10
+        assert store.get_subscription(b.id).label == "moved"
+        assert store.get_baseline() == "def456"
+
+    def test_update_many_unknown_id_writes_nothing(self, temp_dir):
+        store = ConfigStore(temp_dir)
+        store.init("abc123")
+        a = Subscription.create(path="a.py", start_line=1, end_line=2)
+        store.add_subscription(a)
+        a.label = "changed"
+        ghost = Subscription.create(path="x.py", start_line=1, end_line=1)
+
+        with pytest.raises(SubscriptionNotFoundError):
+            store.update_many([a, ghost])
+        assert store.get_subscription(a.id).label is None
+
+    def test_noop_updates_skip_write(self, temp_dir, monkeypatch):
+        store = ConfigStore(temp_dir)
+        store.init("abc123")
+        sub = Subscription.create(path="a.py", start_line=1, end_line=2)
+        store.add_subscription(sub)
+        store.remove_subscription(sub.id)
+
+        saves = []
+        monkeypatch.setattr(store, "save", lambda config: saves.append(config))
+
+        store.update_baseline("abc123")
+        store.remove_subscription(sub.id)
+        store.update_subscription(store.get_subscription(sub.id))
+        store.update_many([store.get_subscription(sub.id)], baseline_ref="abc123")
+
+        assert saves == []
+
+    def test_streaming_write_matches_buffered_format(self, temp_dir):
+        config = Config.create("abc123")
+        for i in range(3):
+            config.subscriptions.append(
+                Subscription.create(
+                    path=f"f{i}.py", start_line=1, end_line=2, label="multi\nline",
+                    anchors=Anchor(context_before=["a"], lines=["b"], context_after=[]),
+                )
+            )
+        data = config.to_dict()
+
+        for d in (data, {**data, "subscriptions": []}):
+            buf = io.BytesIO()
+            _write_streaming(buf, d)
+            assert buf.getvalue() == json_dumps_bytes(d)
+
+    def test_large_config_roundtrip(self, temp_dir):
+        store = ConfigStore(temp_dir)
+        config = store.init("abc123")
+        for i in range(STREAM_WRITE_THRESHOLD + 1):
+            config.subscriptions.append(
+                Subscription.create(path=f"f{i}.py", start_line=1, end_line=1)
+            )
+        store.save(config)
+
+        text = store.config_path.read_text()
+        assert text == json.dumps(json.loads(text), indent=2) + "\n"
+        assert len(store.load().subscriptions) == STREAM_WRITE_THRESHOLD + 1
+
+    def test_set_repo_root_migrates_legacy_config_once(self, temp_dir, monkeypatch):
+        repo_root = temp_dir / "repo"
+        legacy = repo_root / ".codesub" / "subscriptions.json"
+        legacy.parent.mkdir(parents=True)
+        legacy.write_text(json.dumps(Config.create("legacy").to_dict()))
+
+        store = ConfigStore("proj", config_dir=temp_dir / "data")
+        store.set_repo_root(repo_root)
+        assert store.get_baseline() == "legacy"
+
+        calls = []
+        monkeypatch.setattr(store, "_try_migrate", lambda root: calls.append(root))
+        ConfigStore("proj", config_dir=temp_dir / "data").set_repo_root(repo_root)
+        store.set_repo_root(repo_root)
+        assert calls == []
+
+    def test_save_leaves_no_temp_files(self, temp_dir):
+        store = ConfigStore(temp_dir)
+        store.init("abc123")
+        store.update_baseline("def456")
+
+        assert sorted(p.name for p in store.config_dir.iterdir()) == [
+            "last_update_docs", "subscriptions.json",
+        ]
+
+    def test_save_fsyncs_file_and_directory(self, temp_dir, monkeypatch):
+        store = ConfigStore(temp_dir)
+        config = store.init("abc123")
+
+        synced = []
+        monkeypatch.setattr(os, "fsync", lambda fd: synced.append(fd))
+
+        config.repo.baseline_ref = "durable"
+        store.save(config)
+        assert len(synced) == (2 if hasattr(os, "O_DIRECTORY") else 1)
+        assert store.get_baseline() == "durable"
+
+    def test_peek_baseline_reads_file_head(self, temp_dir):
+        store = ConfigStore(temp_dir)
+        store.init("abc123")
+        store.update_baseline("def456")
+
+        fresh = ConfigStore(temp_dir)
+        assert fresh.peek_baseline() == "def456"
+        assert fresh._cache is None  # No full parse was needed
+
+        missing = ConfigStore(temp_dir / "missing")
+        with pytest.raises(ConfigNotFoundError):
+            missing.peek_baseline()
+
+    def test_load_raw_matches_saved_dicts(self, temp_dir):
+        store = ConfigStore(temp_dir)
+        store.init("abc123")
+        sub = Subscription.create(path="a.py", start_line=1, end_line=2, label="L")
+        store.add_subscription(sub)
+
+        raw = store.load_raw()
+        assert raw["repo"]["baseline_ref"] == "abc123"
+        assert raw["subscriptions"] == [sub.to_dict()]
+
+    def test_transaction_saves_once_and_not_on_error(self, temp_dir, monkeypatch):
+        store = ConfigStore(temp_dir)
+        store.init("abc123")
+
+        saves = []
+        original_save = store.save
+        monkeypatch.setattr(
+            store, "save", lambda config: (saves.append(1), original_save(config))
+        )
+
+        with store.transaction() as config:
+            for i in range(5):
+                config.subscriptions.append(
+                    Subscription.create(path=f"f{i}.py", start_line=1, end_line=1)
+                )
+        assert len(saves) == 1
+        assert len(store.list_subscriptions()) == 5
+
+        with pytest.raises(RuntimeError):
+            with store.transaction() as config:
+                config.subscriptions.clear()
+                raise RuntimeError("boom")
+        assert len(saves) == 1
+        assert len(store.list_subscriptions()) == 5
+
+    def test_active_list_memoized_per_file_version(self, temp_dir):
+        store = ConfigStore(temp_dir)
+        store.init("abc123")
+        a = Subscription.create(path="a.py", start_line=1, end_line=1)
+        b = Subscription.create(path="b.py", start_line=1, end_line=1)
+        store.add_subscription(a)
+        store.add_subscription(b)
+
+        first = store.list_subscriptions()
+        assert [s.id for s in first] == [a.id, b.id]
+        first.clear()  # Callers get their own list
+        assert len(store.list_subscriptions()) == 2
+
+        store.remove_subscription(a.id)
+        assert [s.id for s in store.list_subscriptions()] == [b.id]
+        assert len(store.list_subscriptions(include_inactive=True)) == 2
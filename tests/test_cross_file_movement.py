@@ -412,6 +412,54 @@ MAX_RETRIES = 5
         # No proposal when ambiguous
         assert len(result.proposals) == 0
 
+    def test_duplicate_search_stops_early_unless_reported(self, cross_file_repo, monkeypatch):
+        """Without trigger_on_duplicate, search stops at the second match."""
+        import codesub.detector as detector_module
+        from codesub.semantic import PythonIndexer
+
+        repo = GitRepo(cross_file_repo)
+        source = (cross_file_repo / "config.py").read_text()
+        construct = PythonIndexer().find_construct(source, "config.py", "MAX_RETRIES")
+        semantic = SemanticTarget(
+            language="python",
+            kind=construct.kind,
+            qualname=construct.qualname,
+            role=construct.role,
+            interface_hash=construct.interface_hash,
+            body_hash=construct.body_hash,
+        )
+        base_ref = repo.resolve_ref("HEAD")
+
+        write_file(cross_file_repo / "config.py", "TIMEOUT: int = 30\n")
+        for name in ("a_consts.py", "b_consts.py", "c_consts.py"):
+            write_file(cross_file_repo / name, "MAX_RETRIES = 5\n")
+        run_git(cross_file_repo, "add", ".")
+        run_git(cross_file_repo, "commit", "-m", "Triplicate MAX_RETRIES")
+        target_ref = repo.resolve_ref("HEAD")
+
+        indexed = []
+        get_or_index = detector_module.get_or_index
+
+        def recording_get_or_index(source, path, language, indexer):
+            indexed.append(path)
+            return get_or_index(source, path, language, indexer)
+
+        monkeypatch.setattr(detector_module, "get_or_index", recording_get_or_index)
+
+        sub = Subscription.create(
+            path="config.py", start_line=1, end_line=1, semantic=semantic
+        )
+        result = Detector(repo).scan([sub], base_ref, target_ref)
+        assert len(result.unchanged) == 1
+        assert "c_consts.py" not in indexed
+
+        reporting = Subscription.create(
+            path="config.py", start_line=1, end_line=1, semantic=semantic,
+            trigger_on_duplicate=True,
+        )
+        result = Detector(repo).scan([reporting], base_ref, target_ref)
+        assert len(result.triggers[0].details["locations"]) == 3
+
     def test_language_boundary_enforced(self, cross_file_repo):
         """Python construct not matched in Java file with same content."""
         repo = GitRepo(cross_file_repo)
@@ -2,9 +2,9 @@
 
 import pytest
 
-from codesub.detector import Detector
+from codesub.detector import Detector, _HunkIndex
 from codesub.git_repo import GitRepo
-from codesub.models import Subscription
+from codesub.models import Hunk, Subscription
 
 from .conftest import commit_changes
 
@@ -153,6 +153,52 @@ class TestDetectorShifts:
         assert len(result.unchanged) == 1
         assert result.unchanged[0].id == sub.id
 
+    def test_empty_diff_short_circuits(self, git_repo, monkeypatch):
+        """With no diff at all, every sub is unchanged without further git work."""
+        repo = GitRepo(git_repo)
+        base_ref = repo.head()
+        subs = [
+            Subscription.create(path="test.txt", start_line=2, end_line=3),
+            Subscription.create(path="test.txt", start_line=5, end_line=5),
+        ]
+
+        def fail(*args, **kwargs):
+            raise AssertionError("file contents should not be read")
+
+        monkeypatch.setattr(repo, "show_file", fail)
+        monkeypatch.setattr(repo, "show_file_text", fail)
+        result = Detector(repo).scan(subs, base_ref, base_ref)
+
+        assert result.triggers == []
+        assert result.proposals == []
+        assert [s.id for s in result.unchanged] == [s.id for s in subs]
+
+    def test_repeated_scan_reuses_parsed_diff(self, git_repo, monkeypatch):
+        """A detector parses an unchanged diff only once."""
+        repo = GitRepo(git_repo)
+        base_ref = repo.head()
+        (git_repo / "test.txt").write_text("new line\nline 1\nline 2\nline 3\nline 4\nline 5\n")
+        sub = Subscription.create(path="test.txt", start_line=4, end_line=5)
+        detector = Detector(repo)
+
+        parse_patch = detector.parser.parse_patch
+        calls = []
+
+        def counting_parse_patch(text):
+            calls.append(text)
+            return parse_patch(text)
+
+        monkeypatch.setattr(detector.parser, "parse_patch", counting_parse_patch)
+        first = detector.scan([sub], base_ref)
+        second = detector.scan([sub], base_ref)
+        assert len(calls) == 1
+        assert first.proposals[0].shift == second.proposals[0].shift == 1
+
+        # A different diff is parsed again
+        (git_repo / "test.txt").write_text("a\nb\nline 1\nline 2\nline 3\nline 4\nline 5\n")
+        assert detector.scan([sub], base_ref).proposals[0].shift == 2
+        assert len(calls) == 2
+
     def test_changes_after_range_do_not_shift(self, git_repo):
         """Changes after the subscription range should not affect it."""
         repo = GitRepo(git_repo)
@@ -172,3 +218,52 @@ class TestDetectorShifts:
         assert len(result.triggers) == 0
         assert len(result.proposals) == 0  # No shift needed
         assert len(result.unchanged) == 1
+
+    def test_subs_sharing_a_file_keep_scan_order(self, git_repo):
+        """Subs grouped per file still come back in subscription order."""
+        repo = GitRepo(git_repo)
+        (git_repo / "other.txt").write_text("a\nb\n")
+        base_ref = commit_changes(git_repo, "Add other file")
+
+        subs = [
+            Subscription.create(path="test.txt", start_line=4, end_line=4),
+            Subscription.create(path="other.txt", start_line=1, end_line=1),
+            Subscription.create(path="test.txt", start_line=5, end_line=5),
+            Subscription.create(path="test.txt", start_line=1, end_line=1),
+        ]
+
+        # Insert 2 lines after line 2 of test.txt
+        (git_repo / "test.txt").write_text(
+            "line 1\nline 2\nNEW 1\nNEW 2\nline 3\nline 4\nline 5\n"
+        )
+        commit_changes(git_repo, "Insert in the middle")
+
+        result = Detector(repo).scan(subs, base_ref, repo.head())
+
+        assert [p.subscription_id for p in result.proposals] == [subs[0].id, subs[2].id]
+        assert [p.shift for p in result.proposals] == [2, 2]
+        assert [s.id for s in result.unchanged] == [subs[1].id, subs[3].id]
+
+
+class TestCalculateShift:
+    """Unit tests for the prefix-sum shift calculation."""
+
+    def test_only_hunks_before_start_count(self):
+        hunks = [
+            Hunk(old_start=0, old_count=0, new_start=1, new_count=3),   # insert at top
+            Hunk(old_start=5, old_count=2, new_start=0, new_count=1),   # before
+            Hunk(old_start=9, old_count=0, new_start=0, new_count=4),   # insert after 9
+            Hunk(old_start=10, old_count=0, new_start=0, new_count=2),  # insert after 10
+            Hunk(old_start=30, old_count=2, new_start=0, new_count=0),  # after
+        ]
+        index = _HunkIndex(hunks)
+        detector = Detector.__new__(Detector)
+
+        def shift(start, end):
+            sub = Subscription.create(path="f.txt", start_line=start, end_line=end)
+            return detector._calculate_shift(sub, index)
+
+        assert shift(1, 1) == 3            # only the top insertion
+        assert shift(10, 10) == 3 - 1 + 4  # insertion after line 10 doesn't shift it
+        assert shift(11, 20) == 3 - 1 + 4 + 2
+        assert shift(40, 41) == 3 - 1 + 4 + 2 - 2
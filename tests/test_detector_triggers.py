@@ -1,10 +1,13 @@
 """Tests for Detector trigger detection."""
 
+import random
+
 import pytest
 
-from codesub.detector import Detector
+from codesub.detector import Detector, _HunkIndex
 from codesub.git_repo import GitRepo
-from codesub.models import Subscription
+from codesub.diff_parser import ranges_overlap
+from codesub.models import FileDiff, Hunk, Subscription
 
 from .conftest import commit_changes, get_head
 
@@ -188,3 +191,43 @@ class TestDetectorTriggers:
         assert len(result.triggers) == 0
         assert len(result.proposals) == 0
         assert len(result.unchanged) == 0
+
+
+class TestTriggerWindow:
+    """The bisect window in _check_trigger must match a full hunk scan."""
+
+    @staticmethod
+    def _brute_force(sub, hunks):
+        matched = []
+        for h in hunks:
+            if h.old_count > 0:
+                if ranges_overlap(sub.start_line, sub.end_line,
+                                  h.old_start, h.old_start + h.old_count - 1):
+                    matched.append(h)
+            elif sub.start_line <= h.old_start < sub.end_line:
+                matched.append(h)
+        return matched
+
+    def test_matches_brute_force_on_random_diffs(self):
+        rng = random.Random(1234)
+        detector = Detector.__new__(Detector)
+
+        for _ in range(200):
+            # Non-overlapping hunks on the old side, as git produces
+            hunks = []
+            line = 0
+            for _ in range(rng.randint(1, 8)):
+                line += rng.randint(1, 6)
+                count = rng.choice([0, 0, 1, 2, 4])
+                hunks.append(Hunk(line, count, 0, rng.randint(0, 3)))
+                line += count
+            fd = FileDiff(old_path="f.txt", new_path="f.txt", hunks=hunks)
+            index = _HunkIndex(hunks)
+
+            start = rng.randint(1, line + 2)
+            sub = Subscription.create(
+                path="f.txt", start_line=start, end_line=start + rng.randint(0, 6)
+            )
+            trigger = detector._check_trigger(sub, fd, False, index)
+            expected = self._brute_force(sub, hunks)
+            assert (trigger.matching_hunks if trigger else []) == expected
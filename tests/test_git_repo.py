@@ -44,6 +44,27 @@ class TestGitRepo:
 
         assert len(resolved) == 40
 
+    def test_resolve_ref_caches_hashes_not_symbolic_refs(self, git_repo, monkeypatch):
+        repo = GitRepo(git_repo)
+        first = repo.resolve_ref("HEAD")
+        assert repo.resolve_ref(first) == first
+
+        (git_repo / "test.txt").write_text("changed\n")
+        new_head = commit_changes(git_repo, "Move HEAD")
+        assert repo.resolve_ref("HEAD") == new_head  # HEAD is re-resolved
+        assert repo.resolve_ref(new_head) == new_head
+        other = GitRepo(git_repo)
+        _ = other.root
+
+        def fail(*args, **kwargs):
+            raise AssertionError("git should not be called")
+
+        monkeypatch.setattr(subprocess, "run", fail)
+        # A full hash resolved once is answered by any instance without git
+        assert other.resolve_ref(first) == first
+        with pytest.raises(AssertionError):
+            other.resolve_ref("HEAD")
+
     def test_show_file_returns_lines(self, git_repo):
         repo = GitRepo(git_repo)
         lines = repo.show_file("HEAD", "test.txt")
@@ -75,6 +96,27 @@ class TestGitRepo:
         new_lines = repo.show_file("HEAD", "test.txt")
         assert new_lines == ["modified content"]
 
+    def test_show_files_matches_show_file_text(self, git_repo):
+        repo = GitRepo(git_repo)
+        (git_repo / "subdir").mkdir()
+        (git_repo / "subdir" / "nested.txt").write_text("a\n\nb")
+        (git_repo / "empty.txt").write_text("")
+        (git_repo / "crlf.txt").write_bytes(b"one\r\ntwo\r\n")
+        (git_repo / "binary.bin").write_bytes(b"\xff\xfe\x00")
+        commit_changes(git_repo, "Add files")
+        paths = ["test.txt", "subdir/nested.txt", "empty.txt", "crlf.txt"]
+
+        (git_repo / "with space.txt").write_text("spaced\n")
+        commit_changes(git_repo, "Add spaced file")
+        paths.append("with space.txt")
+        missing = ["missing.txt", "no such file.py", "gone 12", "x missing"]
+
+        contents = repo.show_files("HEAD", paths + ["binary.bin", "subdir"] + missing)
+
+        assert contents == {path: repo.show_file_text("HEAD", path) for path in paths}
+        assert repo.show_file("HEAD", "subdir/nested.txt") == ["a", "", "b"]
+        assert repo.show_file("HEAD", "empty.txt") == []
+
     def test_diff_patch_returns_diff(self, git_repo):
         repo = GitRepo(git_repo)
         old_head = repo.head()
@@ -96,6 +138,31 @@ class TestGitRepo:
         diff = repo.diff_patch(head, head)
         assert diff.strip() == ""
 
+    def test_diff_patch_cached_for_object_names_only(self, git_repo, monkeypatch):
+        repo = GitRepo(git_repo)
+        old_head = repo.head()
+        (git_repo / "test.txt").write_text("line 1\nchanged\n")
+        new_head = commit_changes(git_repo, "Modify")
+
+        diff = repo.diff_patch(old_head, new_head)
+        (git_repo / "test.txt").write_text("line 1\nchanged again\n")
+        assert repo.diff_patch(old_head, "HEAD") == diff
+        working_diff = repo.diff_patch(old_head)
+        other = GitRepo(git_repo)
+        _ = other.root
+
+        def fail(*args, **kwargs):
+            raise AssertionError("git should not be called")
+
+        monkeypatch.setattr(subprocess, "run", fail)
+        # Another instance on the same repo shares the cache
+        assert other.diff_patch(old_head, new_head) == diff
+        with pytest.raises(AssertionError):
+            repo.diff_patch(old_head, "HEAD")
+        with pytest.raises(AssertionError):
+            repo.diff_patch(old_head)
+        assert "changed again" in working_diff
+
     def test_diff_name_status_detects_rename(self, git_repo):
         repo = GitRepo(git_repo)
         old_head = repo.head()
@@ -114,6 +181,35 @@ class TestGitRepo:
         assert "test.txt" in name_status
         assert "renamed.txt" in name_status
 
+    def test_patch_headers_match_name_status(self, git_repo):
+        """Maps derived from the patch agree with `git diff --name-status`."""
+        from codesub.diff_parser import DiffParser
+
+        repo = GitRepo(git_repo)
+        (git_repo / "keep.txt").write_text("a\nb\nc\n")
+        (git_repo / "gone.txt").write_text("x\n")
+        (git_repo / "moved.txt").write_text("1\n2\n3\n4\n5\n6\n")
+        old_head = commit_changes(git_repo, "Add files")
+
+        (git_repo / "keep.txt").write_text("a\nB\nc\n")
+        (git_repo / "gone.txt").unlink()
+        (git_repo / "new.txt").write_text("n\n")
+        subprocess.run(
+            ["git", "mv", "moved.txt", "sub_moved.txt"],
+            cwd=git_repo, capture_output=True, check=True,
+        )
+        commit_changes(git_repo, "Modify, delete, add, rename")
+
+        parser = DiffParser()
+        file_diffs = parser.parse_patch(repo.diff_patch(old_head, "HEAD"))
+        derived = parser.status_from_diffs(file_diffs)
+        rename_map, status_map = parser.parse_name_status(
+            repo.diff_name_status(old_head, "HEAD")
+        )
+
+        assert derived[0] == rename_map == {"moved.txt": "sub_moved.txt"}
+        assert derived[1] == {path: status[0] for path, status in status_map.items()}
+
     def test_relative_path(self, git_repo):
         repo = GitRepo(git_repo)
         abs_path = git_repo / "subdir" / "file.txt"
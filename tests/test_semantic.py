@@ -2,7 +2,16 @@
 
 import pytest
 
-from codesub.semantic import Construct, PythonIndexer, compute_body_hash, compute_interface_hash
+from codesub import _parse_cache
+from codesub.semantic import (
+    Construct,
+    PythonIndexer,
+    UnsupportedLanguageError,
+    compute_body_hash,
+    compute_interface_hash,
+    detect_language,
+    language_for_path,
+)
 from codesub.utils import LineTarget, SemanticTargetSpec, parse_target_spec
 
 
@@ -513,3 +522,65 @@ class TestSemanticModels:
         restored = Subscription.from_dict(data)
         assert restored.semantic is not None
         assert restored.semantic.qualname == "Config.TIMEOUT"
+
+
+class TestParseCache:
+    """Tests for the content-addressed construct cache."""
+
+    class CountingIndexer(PythonIndexer):
+        def __init__(self):
+            super().__init__()
+            self.calls = 0
+
+        def index_file(self, source, path):
+            self.calls += 1
+            return super().index_file(source, path)
+
+    def setup_method(self):
+        _parse_cache.clear()
+
+    def test_same_source_indexed_once(self):
+        indexer = self.CountingIndexer()
+        source = "MAX = 1\n"
+
+        first = _parse_cache.get_or_index(source, "a.py", "python", indexer)
+        second = _parse_cache.get_or_index(source, "a.py", "python", indexer)
+
+        assert indexer.calls == 1
+        assert first == second
+        first.clear()
+        assert _parse_cache.get_or_index(source, "a.py", "python", indexer) == second
+
+    def test_key_includes_source_and_path(self):
+        indexer = self.CountingIndexer()
+
+        _parse_cache.get_or_index("MAX = 1\n", "a.py", "python", indexer)
+        moved = _parse_cache.get_or_index("MAX = 1\n", "b.py", "python", indexer)
+        changed = _parse_cache.get_or_index("MAX = 2\n", "a.py", "python", indexer)
+
+        assert indexer.calls == 3
+        assert moved[0].path == "b.py"
+        assert changed[0].body_hash != moved[0].body_hash
+
+    def test_least_recently_used_evicted(self, monkeypatch):
+        monkeypatch.setattr(_parse_cache, "MAX_ENTRIES", 2)
+        indexer = self.CountingIndexer()
+
+        for value in (1, 2, 3):
+            _parse_cache.get_or_index(f"X = {value}\n", "a.py", "python", indexer)
+        _parse_cache.get_or_index("X = 1\n", "a.py", "python", indexer)
+
+        assert indexer.calls == 4
+
+
+class TestRegistry:
+    """Tests for language lookup by path."""
+
+    def test_language_for_path(self):
+        assert language_for_path("pkg/module.py") == "python"
+        assert language_for_path("README.MD") is None
+        assert language_for_path("Makefile") is None
+
+    def test_detect_language_unknown_raises(self):
+        with pytest.raises(UnsupportedLanguageError):
+            detect_language("README.md")
@@ -471,3 +471,96 @@ class Config:
         assert len(result.triggers) == 1
         assert result.triggers[0].change_type == "CONTENT"
         assert "body_changed" in result.triggers[0].reasons
+
+    def test_file_read_once_per_scan(self, semantic_repo, monkeypatch):
+        """Subscriptions on the same file share one read of its content."""
+        repo = GitRepo(semantic_repo)
+        detector = Detector(repo)
+
+        from codesub.semantic import PythonIndexer
+
+        indexer = PythonIndexer()
+        source = (semantic_repo / "config.py").read_text()
+        subs = []
+        for qualname in ("MAX_RETRIES", "TIMEOUT", "Config.validate"):
+            construct = indexer.find_construct(source, "config.py", qualname)
+            subs.append(Subscription.create(
+                path="config.py",
+                start_line=construct.start_line,
+                end_line=construct.end_line,
+                semantic=SemanticTarget(
+                    language="python",
+                    kind=construct.kind,
+                    qualname=construct.qualname,
+                    role=construct.role,
+                    interface_hash=construct.interface_hash,
+                    body_hash=construct.body_hash,
+                ),
+            ))
+
+        calls = []
+        show_file_text = repo.show_file_text
+        show_files = repo.show_files
+
+        def counting_show_file_text(ref, path):
+            calls.append((ref, path))
+            return show_file_text(ref, path)
+
+        def counting_show_files(ref, paths):
+            calls.extend((ref, path) for path in paths)
+            return show_files(ref, paths)
+
+        monkeypatch.setattr(repo, "show_file_text", counting_show_file_text)
+        monkeypatch.setattr(repo, "show_files", counting_show_files)
+
+        base_ref = repo.resolve_ref("HEAD")
+        result = detector.scan(subs, base_ref, base_ref)
+        assert len(result.unchanged) == 3
+        assert calls == [(base_ref, "config.py")]
+
+        # A new scan reads the file again
+        detector.scan(subs, base_ref, base_ref)
+        assert len(calls) == 2
+
+    def test_mixed_subscriptions_keep_scan_order(self, semantic_repo):
+        """Results follow subscription order when subs are checked per file."""
+        repo = GitRepo(semantic_repo)
+        detector = Detector(repo)
+
+        from codesub.semantic import PythonIndexer
+
+        (semantic_repo / "other.py").write_text("LIMIT = 1\n")
+        run_git(semantic_repo, "add", ".")
+        run_git(semantic_repo, "commit", "-m", "Add other.py")
+
+        indexer = PythonIndexer()
+        subs = []
+        for path, qualname in (
+            ("config.py", "MAX_RETRIES"),
+            ("other.py", "LIMIT"),
+            ("config.py", None),
+            ("config.py", "TIMEOUT"),
+        ):
+            if qualname is None:
+                subs.append(Subscription.create(path=path, start_line=1, end_line=1))
+                continue
+            source = (semantic_repo / path).read_text()
+            construct = indexer.find_construct(source, path, qualname)
+            subs.append(Subscription.create(
+                path=path,
+                start_line=construct.start_line,
+                end_line=construct.end_line,
+                semantic=SemanticTarget(
+                    language="python",
+                    kind=construct.kind,
+                    qualname=construct.qualname,
+                    role=construct.role,
+                    interface_hash=construct.interface_hash,
+                    body_hash=construct.body_hash,
+                ),
+            ))
+
+        base_ref = repo.resolve_ref("HEAD")
+        result = detector.scan(subs, base_ref, base_ref)
+
+        assert [s.id for s in result.unchanged] == [s.id for s in subs]